@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Testy uruchamiamy z katalogu repozytorium albo z tests/ - pakiety utils i tryby muszą być widoczne
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
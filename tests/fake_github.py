@@ -0,0 +1,281 @@
+import base64
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+# ------------------------------
+# Lokalny zastępca API GitHuba do testów wysyłki
+# ------------------------------
+#
+# W zakresie, którego używa utils.wysylka:
+#   contents API - GET katalogu i pliku (z ETagiem i 304, opcjonalnie ?ref=<commit>), PUT pliku (422 bez sha dla istniejącego pliku,
+#                  409 przy nieaktualnym sha); każdy udany PUT to commit na gałęzi main
+#   Git Data API - GET ref/heads/main i commits/<sha>, POST blobs, trees i commits, PATCH refs/heads/main
+#                  (bez force tylko do przodu, inaczej 422)
+# Opcjonalne awarie: fail_rate - 502 zamiast zapisu, drop_rate - zapis się udaje, ale odpowiedź ginie.
+# Do pomiarów (utils.pomiary): latency - opóźnienie każdej odpowiedzi, connect_cost - koszt nowego połączenia
+# (jak uzgadnianie TLS); stats liczy też połączenia i bajty w obie strony.
+# Do odtwarzania wyścigów: before[metoda] - funkcja wołana raz przed obsługą następnego takiego zapytania,
+# drop_next - metody, dla których następna udana odpowiedź zaginie.
+
+
+def git_blob_sha(content):
+    return hashlib.sha1(b"blob %d\0" % len(content) + content).hexdigest()
+
+
+def _object_sha(obj):
+    return hashlib.sha1(json.dumps(obj, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+class FakeGitHub:
+    def __init__(self, fail_rate=0.0, drop_rate=0.0, latency=0.0, seed=0, connect_cost=0.0):
+        self.fail_rate = fail_rate
+        self.drop_rate = drop_rate
+        self.latency = latency
+        self.connect_cost = connect_cost
+        self.lock = threading.RLock()
+        self.rng = random.Random(seed)
+        self.stats = {"GET": 0, "PUT": 0, "POST": 0, "PATCH": 0, "commits": 0,
+                      "304": 0, "409": 0, "422": 0, "5xx": 0, "dropped": 0,
+                      "connections": 0, "bytes_in": 0, "bytes_out": 0}
+        self.before = {}
+        self.drop_next = set()
+
+        self.blobs = {}  # sha -> treść
+        self.trees = {}  # sha -> {ścieżka: sha bloba}
+        self.commits = {}  # sha -> {"tree", "parents", "message"}
+        self.commit_log = []  # (wiadomość, zmienione ścieżki) dla commitów na main
+        self.head = self._new_commit(self._new_tree({}), [], "init")
+
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def log_message(self, *args):
+                pass
+
+            def setup(self):
+                super().setup()
+                fake.count("connections")
+                time.sleep(fake.connect_cost)
+
+            def handle_method(self, method):
+                body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+                fake.count(method)
+                fake.count("bytes_in", len(body))
+                time.sleep(fake.latency)
+                fake.handle(self, method, body)
+
+            def do_GET(self):
+                self.handle_method("GET")
+
+            def do_PUT(self):
+                self.handle_method("PUT")
+
+            def do_POST(self):
+                self.handle_method("POST")
+
+            def do_PATCH(self):
+                self.handle_method("PATCH")
+
+        ThreadingHTTPServer.request_queue_size = 128
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = f"http://127.0.0.1:{self.server.server_port}"
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def count(self, name, n=1):
+        with self.lock:
+            self.stats[name] = self.stats.get(name, 0) + n
+
+    # ------------------------------
+    # Repozytorium
+    # ------------------------------
+
+    def _new_tree(self, entries):
+        sha = _object_sha(entries)
+        self.trees[sha] = dict(entries)
+        return sha
+
+    def _new_commit(self, tree, parents, message):
+        sha = _object_sha({"tree": tree, "parents": parents, "message": message, "n": len(self.commits)})
+        self.commits[sha] = {"tree": tree, "parents": parents, "message": message}
+        return sha
+
+    def _move_head(self, commit_sha):
+        before = self.tree()
+        self.head = commit_sha
+        after = self.tree()
+        self.stats["commits"] += 1
+        self.commit_log.append((self.commits[commit_sha]["message"],
+                                sorted(p for p in after if before.get(p) != after[p])))
+
+    def tree(self):
+        return self.trees[self.commits[self.head]["tree"]]
+
+    def commit_files(self, files, message):
+        # Commit na main poza testowaną aplikacją (np. gra zapisana w tej chwili przez inny proces)
+        with self.lock:
+            entries = dict(self.tree())
+            for path, content in files.items():
+                self.blobs[git_blob_sha(content)] = content
+                entries[path] = git_blob_sha(content)
+            self._move_head(self._new_commit(self._new_tree(entries), [self.head], message))
+
+    @property
+    def files(self):
+        with self.lock:
+            return {path: {"sha": sha, "content": self.blobs[sha]} for path, sha in self.tree().items()}
+
+    def results(self):
+        # Pliki wyników bez licznika dnia
+        return {path: f["content"] for path, f in self.files.items() if "/liczniki/" not in path}
+
+    # ------------------------------
+    # Odpowiedzi
+    # ------------------------------
+
+    def send(self, handler, code, obj=None, headers=None):
+        body = json.dumps(obj).encode("utf-8") if obj is not None else b""
+        handler.send_response(code)
+        for name, value in (headers or {}).items():
+            handler.send_header(name, value)
+        handler.send_header("Content-Length", str(len(body)))
+        handler.end_headers()
+        handler.wfile.write(body)
+        self.count("bytes_out", len(body))
+
+    def send_etag(self, handler, obj):
+        etag = '"%s"' % hashlib.sha1(json.dumps(obj).encode("utf-8")).hexdigest()
+        if handler.headers.get("If-None-Match") == etag:
+            self.count("304")
+            return self.send(handler, 304, headers={"ETag": etag})
+        self.send(handler, 200, obj, {"ETag": etag})
+
+    def send_written(self, handler, method, code, obj):
+        # Odpowiedź po udanym zapisie - może zaginąć (zapis zostaje)
+        with self.lock:
+            dropped = method in self.drop_next or self.rng.random() < self.drop_rate
+            self.drop_next.discard(method)
+        if dropped:
+            self.count("dropped")
+            handler.close_connection = True
+            handler.connection.shutdown(2)
+            return
+        self.send(handler, code, obj)
+
+    def handle(self, handler, method, body):
+        with self.lock:
+            hook = self.before.pop(method, None)
+        if hook is not None:
+            hook(self)
+        if method != "GET" and self.rng.random() < self.fail_rate:
+            self.count("5xx")
+            return self.send(handler, 502, {"message": "Bad Gateway"})
+
+        url = urlsplit(handler.path)
+        match = re.match(r"/repos/[^/]+/[^/]+/(contents|git)/?(.*)", url.path)
+        api, path = match.groups() if match else (None, None)
+        payload = json.loads(body) if body else None
+        if api == "contents" and method == "GET":
+            return self.contents_get(handler, path, parse_qs(url.query).get("ref", [None])[0])
+        if api == "contents" and method == "PUT":
+            return self.contents_put(handler, path, payload)
+        if api == "git":
+            return self.git(handler, method, path, payload)
+        self.send(handler, 404, {"message": "Not Found"})
+
+    # ------------------------------
+    # Contents API
+    # ------------------------------
+
+    def contents_get(self, handler, path, ref=None):
+        with self.lock:
+            if ref is not None and ref not in self.commits:
+                return self.send(handler, 404, {"message": "No commit found for the ref"})
+            tree = self.tree() if ref is None else self.trees[self.commits[ref]["tree"]]
+            if path in tree:
+                sha = tree[path]
+                return self.send_etag(handler, {
+                    "name": path.rsplit("/", 1)[-1], "path": path, "sha": sha,
+                    "content": base64.encodebytes(self.blobs[sha]).decode("ascii"), "encoding": "base64",
+                })
+            listing = [{"name": p.rsplit("/", 1)[-1], "path": p, "sha": sha}
+                       for p, sha in sorted(tree.items()) if p.rsplit("/", 1)[0] == path]
+            exists = any(p.startswith(path + "/") for p in tree)
+        if not exists:
+            return self.send(handler, 404, {"message": "Not Found"})
+        self.send_etag(handler, listing)
+
+    def contents_put(self, handler, path, payload):
+        content = base64.b64decode(payload["content"])
+        sha = git_blob_sha(content)
+        with self.lock:
+            current = self.tree().get(path)
+            if current is not None and payload.get("sha") != current:
+                code = 409 if payload.get("sha") else 422
+                self.stats[str(code)] += 1
+            else:
+                code = 201 if current is None else 200
+                self.commit_files({path: content}, payload["message"])
+        if code in (409, 422):
+            return self.send(handler, code, {"message": "sha does not match" if code == 409 else "sha wasn't supplied"})
+        self.send_written(handler, "PUT", code, {"content": {"path": path, "sha": sha}})
+
+    # ------------------------------
+    # Git Data API
+    # ------------------------------
+
+    def git(self, handler, method, path, payload):
+        with self.lock:
+            if method == "GET" and path == "ref/heads/main":
+                return self.send_etag(handler, {"ref": "refs/heads/main", "object": {"sha": self.head, "type": "commit"}})
+            if method == "GET" and path.startswith("commits/"):
+                sha = path.split("/", 1)[1]
+                commit = self.commits.get(sha)
+                if commit is None:
+                    return self.send(handler, 404, {"message": "Not Found"})
+                return self.send_etag(handler, {
+                    "sha": sha, "tree": {"sha": commit["tree"]}, "message": commit["message"],
+                    "parents": [{"sha": parent} for parent in commit["parents"]],
+                })
+            if method == "POST" and path == "blobs":
+                content = base64.b64decode(payload["content"])
+                self.blobs[git_blob_sha(content)] = content
+                return self.send(handler, 201, {"sha": git_blob_sha(content)})
+            if method == "POST" and path == "trees":
+                entries = dict(self.trees.get(payload.get("base_tree"), {}))
+                for entry in payload["tree"]:
+                    if "content" in entry:
+                        content = entry["content"].encode("utf-8")
+                        self.blobs[git_blob_sha(content)] = content
+                        entry = dict(entry, sha=git_blob_sha(content))
+                    if entry["sha"] not in self.blobs:
+                        return self.send(handler, 422, {"message": "Invalid tree info"})
+                    entries[entry["path"]] = entry["sha"]
+                return self.send(handler, 201, {"sha": self._new_tree(entries)})
+            if method == "POST" and path == "commits":
+                if payload["tree"] not in self.trees or any(p not in self.commits for p in payload["parents"]):
+                    return self.send(handler, 422, {"message": "Invalid tree or parent"})
+                sha = self._new_commit(payload["tree"], payload["parents"], payload["message"])
+                return self.send(handler, 201, {"sha": sha})
+            if method == "PATCH" and path == "refs/heads/main":
+                commit = self.commits.get(payload["sha"])
+                if commit is None or (not payload.get("force") and self.head not in commit["parents"]):
+                    self.stats["422"] += 1
+                    return self.send(handler, 422, {"message": "Update is not a fast forward"})
+                self._move_head(payload["sha"])
+            else:
+                return self.send(handler, 404, {"message": "Not Found"})
+        self.send_written(handler, "PATCH", 200, {"ref": "refs/heads/main", "object": {"sha": payload["sha"]}})
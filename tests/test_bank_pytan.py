@@ -0,0 +1,113 @@
+import multiprocessing
+import os
+
+import pytest
+
+import utils.pytania as pytania
+from utils.bank_pytan import current_version_dir, write_bank
+from utils.pytania import QuestionBankWatcher, QuestionStore, category_names
+
+HEADER = "id;text;categories\n"
+ROWS = [
+    "fun001;Czy Twoje myśli odpływają w kosmos?;Śmieszne\n",
+    "fun002;Czy potrafisz zgubić coś, co trzymasz w ręce?;Śmieszne,Luźne\n",
+    "wol001;Wolisz góry czy morze?;Wolisz\n",
+]
+
+
+@pytest.fixture
+def csv_path(tmp_path):
+    path = tmp_path / "questions.csv"
+    path.write_text(HEADER + "".join(ROWS), encoding="utf-8")
+    return str(path)
+
+
+def rewrite(path, rows):
+    # Nowa treść z mtime na pewno różnym od poprzedniego
+    mtime = os.path.getmtime(path)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(HEADER + "".join(rows))
+    os.utime(path, (mtime + 1, mtime + 1))
+
+
+def _write_same_version(bank_dir, barrier, results):
+    # Proces potomny: wszyscy mają gotowy katalog tymczasowy i naraz podmieniają go na katalog wersji
+    replace = os.replace
+
+    def replace_together(src, dst):
+        if os.path.basename(dst) == "abc":
+            barrier.wait()
+        replace(src, dst)
+
+    os.replace = replace_together
+    try:
+        results.put(write_bank(bank_dir, [("fun001", "Pytanie", ("Śmieszne",))], category_names, source_hash="abc"))
+    except Exception as e:
+        results.put(repr(e))
+
+
+def test_concurrent_writers_of_one_version_all_succeed(tmp_path):
+    bank_dir = str(tmp_path / "bank")
+    ctx = multiprocessing.get_context("fork")
+    barrier, results = ctx.Barrier(8, timeout=30), ctx.Queue()
+    workers = [ctx.Process(target=_write_same_version, args=(bank_dir, barrier, results)) for _ in range(8)]
+    for worker in workers:
+        worker.start()
+    outcomes = [results.get(timeout=60) for _ in workers]
+    for worker in workers:
+        worker.join()
+
+    assert outcomes == [os.path.join(bank_dir, "abc")] * 8
+    assert len(QuestionStore(current_version_dir(bank_dir))) == 1
+    assert sorted(os.listdir(bank_dir)) == ["CURRENT", "abc"]
+
+
+def test_watcher_retries_after_io_error(csv_path, tmp_path, monkeypatch):
+    watcher = QuestionBankWatcher(csv_path, str(tmp_path / "bank"), check_interval=3600)
+    rewrite(csv_path, ROWS + ["dyl001;Prawda czy wygoda?;Dylematy\n"])
+
+    real_write_bank = pytania.write_bank
+    calls = []
+
+    def failing_once(*args, **kwargs):
+        calls.append(1)
+        if len(calls) == 1:
+            raise OSError(28, "No space left on device")
+        return real_write_bank(*args, **kwargs)
+
+    monkeypatch.setattr(pytania, "write_bank", failing_once)
+    assert not watcher.check()
+    assert "No space left" in watcher.last_error
+    assert len(watcher.current()) == 3
+
+    assert watcher.check()
+    assert watcher.last_error is None
+    assert len(watcher.current()) == 4
+
+
+def test_watcher_waits_for_next_change_after_invalid_file(csv_path, tmp_path):
+    watcher = QuestionBankWatcher(csv_path, str(tmp_path / "bank"), check_interval=0)
+    rewrite(csv_path, ROWS + ["fun999;Pytanie bez kategorii\n"])
+    assert not watcher.check()
+    assert "wiersz 5" in watcher.last_error
+    assert not watcher.check()  # ten sam plik nie jest sprawdzany ponownie
+
+    rewrite(csv_path, ROWS + ["fun004;Poprawione pytanie;Śmieszne\n"])
+    assert watcher.check()
+    assert len(watcher.current()) == 4
+
+
+def test_invalid_file_at_startup_is_reported_not_crashed(csv_path, tmp_path):
+    rewrite(csv_path, ROWS + ["fun999;Pytanie bez kategorii\n"])
+    with pytest.raises(ValueError, match="wiersz 5: 2 pól zamiast 3"):
+        QuestionBankWatcher(csv_path, str(tmp_path / "bank"))
+    assert not (tmp_path / "bank").exists() or os.listdir(tmp_path / "bank") == []
+
+
+def test_invalid_file_at_startup_keeps_last_good_bank(csv_path, tmp_path):
+    QuestionBankWatcher(csv_path, str(tmp_path / "bank"))
+    rewrite(csv_path, ROWS + ["fun001;Powtórzone id;Śmieszne\n"])
+
+    watcher = QuestionBankWatcher(csv_path, str(tmp_path / "bank"))
+    assert len(watcher.current()) == 3
+    assert "id 'fun001' powtarza się" in watcher.last_error
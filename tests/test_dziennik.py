@@ -0,0 +1,85 @@
+import json
+import os
+import threading
+import time
+
+from utils.bank_pytan import LEASES_DIR, lease_version
+from utils.dziennik import GameJournal
+from utils.stan_gry import GameState
+
+
+def flush_in_time(journal, timeout=5):
+    # flush() przy martwym wątku zapisu wisiałby w nieskończoność
+    flusher = threading.Thread(target=journal.flush, daemon=True)
+    flusher.start()
+    flusher.join(timeout)
+    return not flusher.is_alive()
+
+
+def journal_files(directory):
+    return sorted(name for name in os.listdir(directory) if not name.endswith(".tmp"))
+
+
+def new_game(journal):
+    game = GameState(mode="Klasyczny")
+    journal.start(game)
+    return game
+
+
+def test_writer_survives_unexpected_errors(tmp_path):
+    journal = GameJournal(str(tmp_path))
+    broken = new_game(journal)
+    broken.results_data.append(object())  # zrzut nie da się zapisać jako JSON (TypeError, nie OSError)
+    journal.snapshot(broken)
+    assert flush_in_time(journal)
+
+    game = new_game(journal)
+    journal.append(game, {"type": "end"})
+    assert flush_in_time(journal)
+    assert journal.resume(game.game_id).finished
+
+
+def test_finished_and_uploaded_game_is_removed(tmp_path):
+    journal = GameJournal(str(tmp_path))
+    game = new_game(journal)
+    for event in ({"type": "end"}, {"type": "uploaded"}):
+        game.apply(event)
+        journal.append(game, event)
+    journal.flush()
+
+    assert journal_files(tmp_path) == []
+    assert journal.resume(game.game_id) is None
+
+
+def test_game_continued_after_removal_is_journaled_again(tmp_path):
+    journal = GameJournal(str(tmp_path))
+    game = new_game(journal)
+    for event in ({"type": "end"}, {"type": "uploaded"}, {"type": "end"}):
+        game.apply(event)
+        journal.append(game, event)
+    game.finished = False  # jak po "Jeszcze nie kończymy!" - kolejne zdarzenie po usunięciu plików
+    journal.append(game, {"type": "uploaded"})
+    journal.flush()
+
+    assert journal_files(tmp_path) == [f"{game.game_id}.jsonl", f"{game.game_id}.snapshot.json"]
+    resumed = journal.resume(game.game_id)
+    assert resumed.results_uploaded and not resumed.finished
+
+
+def test_expired_games_are_swept_and_release_their_bank(tmp_path):
+    journal_dir, version_dir = tmp_path / "dziennik", str(tmp_path / "bank" / "1")
+    journal_dir.mkdir()
+    lease_version(version_dir, "0123456789ab")
+    (journal_dir / "0123456789ab.snapshot.json").write_text(
+        json.dumps({"seq": 0, "offset": 0, "state": {"used": {"bank": version_dir}}}), encoding="utf-8")
+    (journal_dir / "0123456789ab.jsonl").write_text("", encoding="utf-8")
+    old = time.time() - 7200
+    for name in os.listdir(journal_dir):
+        os.utime(journal_dir / name, (old, old))
+    (journal_dir / "ba9876543210.jsonl").write_text("", encoding="utf-8")
+
+    journal = GameJournal(str(journal_dir), ttl=3600)
+    journal.flush()
+
+    assert journal_files(journal_dir) == ["ba9876543210.jsonl"]
+    assert os.listdir(os.path.join(version_dir, LEASES_DIR)) == []
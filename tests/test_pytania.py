@@ -0,0 +1,102 @@
+import random
+
+import pytest
+
+from utils.pytania import QuestionDeck, QuestionStore, UsedQuestions, compile_question_bank
+
+QUESTIONS = [
+    ("fun001", "Czy Twoje myśli odpływają w kosmos?", "Śmieszne"),
+    ("fun002", "Czy potrafisz zgubić coś, co trzymasz w ręce?", "Śmieszne,Luźne"),
+    ("fun003", "Czy śmiejesz się z własnych żartów?", "Śmieszne"),
+    ("wol001", "Wolisz góry czy morze?", "Wolisz"),
+    ("wol002", "Wolisz kawę czy herbatę?", "Wolisz,Luźne"),
+    ("dyl001", "Prawda czy wygoda?", "Dylematy"),
+]
+
+
+def write_csv(path, questions):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("id;text;categories\n")
+        f.writelines(f"{qid};{text};{categories}\n" for qid, text, categories in questions)
+
+
+@pytest.fixture
+def bank(tmp_path):
+    # Zwraca funkcję: lista pytań -> magazyn nowej wersji banku w tym samym katalogu
+    def build(questions=QUESTIONS):
+        csv_path = str(tmp_path / "questions.csv")
+        write_csv(csv_path, questions)
+        return QuestionStore(compile_question_bank(csv_path, str(tmp_path / "questions.bank")))
+    return build
+
+
+def drain(deck, seed=0):
+    rng = random.Random(seed)
+    drawn = []
+    while (ordinal := deck.draw(rng)) is not None:
+        drawn.append(ordinal)
+    return drawn
+
+
+def test_deck_draws_every_question_once(bank):
+    store = bank()
+    categories = ["Śmieszne", "Luźne"]
+    deck = QuestionDeck.build(store, categories)
+    drawn = drain(deck)
+
+    assert len(drawn) == len(set(drawn))
+    assert sorted(drawn) == store.ordinals_for(categories).tolist()
+    assert deck.remaining() == 0
+    assert deck.draw() is None
+
+
+def test_deck_skips_used_questions(bank):
+    store = bank()
+    used = UsedQuestions(store)
+    used.add(store.ordinal("fun002"))
+    drawn = drain(QuestionDeck.build(store, ["Śmieszne", "Luźne"], used))
+
+    assert sorted(store.ids[o] for o in drawn) == ["fun001", "fun003", "wol002"]
+
+
+def test_take_removes_searched_question_from_deck(bank):
+    store = bank()
+    deck = QuestionDeck.build(store, ["Wolisz"])
+    picked = store.ordinal("wol001")
+
+    assert deck.take(picked)
+    assert not deck.take(picked)  # drugi raz już go w talii nie ma
+    assert drain(deck) == [store.ordinal("wol002")]
+
+
+def test_used_questions_survive_snapshot_and_bank_reload(bank):
+    store = bank()
+    used = UsedQuestions(store)
+    for qid in ("fun002", "wol001"):
+        used.add(store.ordinal(qid))
+
+    restored = UsedQuestions.restore(used.snapshot())
+    assert sorted(restored.ids()) == ["fun002", "wol001"]
+
+    # Nowa wersja banku: nowe pytanie na początku przesuwa wszystkie numery porządkowe
+    reloaded = bank([("fun000", "Nowe pytanie?", "Śmieszne")] + QUESTIONS)
+    assert reloaded.path != store.path and reloaded.ordinal("fun002") != store.ordinal("fun002")
+    moved = restored.for_store(reloaded)
+    assert sorted(moved.ids()) == ["fun002", "wol001"]
+
+    drawn = drain(QuestionDeck.build(reloaded, ["Śmieszne", "Wolisz"], moved))
+    assert sorted(reloaded.ids[o] for o in drawn) == ["fun000", "fun001", "fun003", "wol002"]
+
+
+def test_same_version_opened_again_keeps_bits_without_id_map(bank):
+    store = bank()
+    used = UsedQuestions(store)
+    used.add(store.ordinal("wol001"))
+    store._ordinal_by_id = None
+
+    reopened = QuestionStore(store.path)
+    moved = used.for_store(reopened)
+
+    assert moved.store is reopened
+    assert moved.ids() == ["wol001"]
+    assert reopened._ordinal_by_id is None
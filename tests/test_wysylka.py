@@ -0,0 +1,288 @@
+import multiprocessing
+import os
+import threading
+import time
+
+import pytest
+
+import utils.wysylka as wysylka
+from fake_github import FakeGitHub
+from utils.wysylka import UploadQueue
+
+APP_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "streamlit_app.py")
+
+
+@pytest.fixture
+def github():
+    fake = FakeGitHub(latency=0.01)
+    yield fake
+    fake.close()
+
+
+def wait_for(queues_and_keys, timeout=30):
+    deadline = time.monotonic() + timeout
+    while any(q.status(key)["state"] in ("queued", "sending") for q, key in queues_and_keys):
+        assert time.monotonic() < deadline, "wysyłki nie skończyły się na czas"
+        time.sleep(0.01)
+
+
+def game_content(key):
+    return f"wyniki {key} ".encode("utf-8") * 40
+
+
+def test_submit_is_idempotent(github):
+    queue = UploadQueue("token", api=github.url, backoff=0.01)
+    first = queue.submit("gra", game_content("gra"))
+    again = queue.submit("gra", game_content("gra"))
+    wait_for([(queue, "gra")])
+    queue.close()
+
+    assert first["state"] == again["state"] == "queued"
+    assert queue.status("gra")["state"] == "done"
+    assert list(github.results().values()) == [game_content("gra")]
+
+
+def test_competing_queues_get_unique_numbers(github):
+    # Trzy procesy aplikacji (osobne kolejki i sesje HTTP) zapisują gry w tym samym momencie
+    queues = [UploadQueue("token", api=github.url, workers=2, backoff=0.01) for _ in range(3)]
+    jobs = [(queue, f"gra{q}-{i}") for q, queue in enumerate(queues) for i in range(30)]
+    threads = [threading.Thread(target=queue.submit, args=(key, game_content(key))) for queue, key in jobs]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    wait_for(jobs)
+    for queue in queues:
+        queue.close()
+
+    statuses = {key: queue.status(key) for queue, key in jobs}
+    assert {status["state"] for status in statuses.values()} == {"done"}
+    paths = [status["path"] for status in statuses.values()]
+    assert len(set(paths)) == len(jobs)
+    results = github.results()
+    assert all(results[statuses[key]["path"]] == game_content(key) for _, key in jobs)
+
+
+def test_retries_server_errors_and_lost_responses():
+    github = FakeGitHub(fail_rate=0.2, drop_rate=0.15, latency=0.01, seed=1)
+    queue = UploadQueue("token", api=github.url, workers=4, backoff=0.01, max_attempts=8)
+    keys = [f"gra{i}" for i in range(30)]
+    for key in keys:
+        queue.submit(key, game_content(key))
+    wait_for([(queue, key) for key in keys])
+    queue.close()
+    github.close()
+
+    assert {queue.status(key)["state"] for key in keys} == {"done"}
+    # Zgubiona odpowiedź nie może skończyć się drugim plikiem z tą samą grą
+    assert sorted(github.results().values()) == sorted(game_content(key) for key in keys)
+    assert github.stats["5xx"] and github.stats["dropped"]
+
+
+# ------------------------------
+# Wiele ekranów końcowych naraz
+# ------------------------------
+
+def click(at, label=None, key=None):
+    for button in at.button:
+        if (key and button.key == key) or (label and button.label.startswith(label)):
+            button.click()
+            at.run()
+            return
+    raise AssertionError(f"Brak przycisku {label or key}")
+
+
+def end_screen_session(i, barrier, results):
+    # Osobny proces na sesję: AppTest korzysta z globalnego runtime Streamlita i nie działa w wątkach
+    from streamlit.testing.v1 import AppTest
+
+    try:
+        at = AppTest.from_file(APP_PATH, default_timeout=60)
+        at.secrets["GITHUB_TOKEN"] = "token"
+        at.run()
+        click(at, "2-osobowy")
+        for field, name in zip(at.text_input, [f"Gracz{i}a", f"Gracz{i}b"]):
+            field.input(name)
+        at.run()
+        click(at, "✅ Dalej")
+        click(at, key="cat_Wolisz")
+        click(at, "🎯")
+        for _ in range(2):
+            next(b for b in at.button if b.key and b.key.startswith("gp_3")).click()
+            at.run()
+            click(at, "💾 Zapisz")
+
+        barrier.wait()
+        click(at, "❌")
+        deadline = time.monotonic() + 60
+        while not any("zapisane online" in s.value for s in at.success):
+            assert not at.error, [e.value for e in at.error]
+            assert time.monotonic() < deadline, "brak potwierdzenia zapisu"
+            time.sleep(0.2)
+            at.run()
+        results.put((i, None))
+    except BaseException as e:
+        barrier.abort()
+        results.put((i, repr(e)))
+
+
+def test_simultaneous_end_screens(tmp_path, monkeypatch):
+    import io
+
+    import openpyxl
+
+    sessions = 6
+    github = FakeGitHub(fail_rate=0.2, latency=0.05, seed=2)
+    monkeypatch.setattr(wysylka, "GITHUB_API", github.url)
+    monkeypatch.setattr(wysylka, "BACKOFF_SECONDS", 0.05)
+    monkeypatch.chdir(tmp_path)  # wysyłka nie może niczego zapisywać w katalogu roboczym
+
+    context = multiprocessing.get_context("fork")
+    barrier, results = context.Barrier(sessions, timeout=120), context.Queue()
+    processes = [context.Process(target=end_screen_session, args=(i, barrier, results)) for i in range(sessions)]
+    for process in processes:
+        process.start()
+    outcomes = dict(results.get(timeout=300) for _ in processes)
+    for process in processes:
+        process.join()
+    github.close()
+
+    assert outcomes == {i: None for i in range(sessions)}
+    assert os.listdir(tmp_path) == []
+    files = github.results()
+    assert len(files) == sessions
+    # Każda gra trafiła do własnego pliku - z imionami swoich graczy
+    players = {
+        tuple(next(openpyxl.load_workbook(io.BytesIO(content), read_only=True).worksheets[0].values)[5:])
+        for content in files.values()
+    }
+    assert players == {(f"Gracz{i}a", f"Gracz{i}b") for i in range(sessions)}
+
+
+# ------------------------------
+# Tryb zbiorczy (Git Data API)
+# ------------------------------
+
+def today():
+    return time.strftime("%Y-%m-%d")
+
+
+def counter(github):
+    return github.files[wysylka.counter_path(today())]["content"]
+
+
+def submit_batch(queue, keys):
+    for key in keys:
+        queue.submit(key, game_content(key))
+    wait_for([(queue, key) for key in keys])
+
+
+def test_batch_writes_one_commit_per_batch(github):
+    queue = UploadQueue("token", api=github.url, backoff=0.01, batch_seconds=30, batch_games=4)
+    keys = [f"gra{i}" for i in range(12)]
+    submit_batch(queue, keys)
+    queue.close()
+
+    assert github.stats["commits"] == 3
+    assert [len(paths) for _, paths in github.commit_log] == [5, 5, 5]  # 4 gry i licznik dnia
+    results = github.results()
+    for key in keys:
+        status = queue.status(key)
+        assert status["state"] == "done"
+        assert results[status["path"]] == game_content(key)
+    assert counter(github) == b'{"ostatni": 12}'
+
+
+def test_batch_renumbers_after_ref_conflict(github):
+    # Między odczytem gałęzi a jej przesunięciem inny proces zapisuje grę nr 1 - nasza paczka dostaje 422,
+    # czyta gałąź od nowa i bierze kolejne numery, nie nadpisując cudzego pliku
+    other_path = f"wyniki/gra001_{today()}.xlsx"
+    github.before["PATCH"] = lambda fake: fake.commit_files({
+        other_path: b"inna gra",
+        wysylka.counter_path(today()): b'{"ostatni": 1}',
+    }, "inny proces")
+    queue = UploadQueue("token", api=github.url, backoff=0.01, batch_seconds=30, batch_games=3)
+    keys = ["a", "b", "c"]
+    submit_batch(queue, keys)
+    queue.close()
+
+    assert github.stats["422"] == 1
+    assert [queue.status(key)["path"] for key in keys] == [f"wyniki/gra{n:03d}_{today()}.xlsx" for n in (2, 3, 4)]
+    assert {queue.status(key)["state"] for key in keys} == {"done"}
+    assert github.results()[other_path] == b"inna gra"
+    assert counter(github) == b'{"ostatni": 4}'
+
+
+def test_batch_skips_numbers_already_taken(github):
+    # Licznik dnia zostaje w tyle za plikami (np. gry zapisane przez starszą wersję aplikacji) -
+    # zajęte numery pomijamy zamiast nadpisać pliki commitem przesuwającym gałąź do przodu
+    taken = {f"wyniki/gra{n:03d}_{today()}.xlsx": b"starsza gra %d" % n for n in (1, 3)}
+    github.commit_files({**taken, wysylka.counter_path(today()): b'{"ostatni": 0}'}, "starsza wersja")
+    queue = UploadQueue("token", api=github.url, backoff=0.01, batch_seconds=30, batch_games=3)
+    keys = ["a", "b", "c"]
+    submit_batch(queue, keys)
+    queue.close()
+
+    assert [queue.status(key)["path"] for key in keys] == [f"wyniki/gra{n:03d}_{today()}.xlsx" for n in (2, 4, 5)]
+    assert {path: github.results()[path] for path in taken} == taken
+    assert counter(github) == b'{"ostatni": 5}'
+
+
+def test_batch_confirms_lost_ref_response_by_blob_sha(github):
+    # Gałąź przesunięta, ale odpowiedź zaginęła: kolejna próba rozpoznaje własne pliki po sha bloba
+    # i nie tworzy drugiego commita z tymi samymi grami
+    github.drop_next.add("PATCH")
+    queue = UploadQueue("token", api=github.url, backoff=0.01, batch_seconds=30, batch_games=3)
+    keys = ["a", "b", "c"]
+    submit_batch(queue, keys)
+    queue.close()
+
+    assert github.stats["dropped"] == 1
+    assert github.stats["commits"] == 1
+    results = github.results()
+    assert len(results) == 3
+    for key in keys:
+        status = queue.status(key)
+        assert status["state"] == "done" and status["attempts"] == 2
+        assert results[status["path"]] == game_content(key)
+
+
+def test_batch_flushes_on_close(github):
+    queue = UploadQueue("token", api=github.url, backoff=0.01, batch_seconds=3600, batch_games=50)
+    keys = [f"gra{i}" for i in range(5)]
+    for key in keys:
+        queue.submit(key, game_content(key))
+    time.sleep(0.1)
+    assert github.stats["commits"] == 0
+    queue.close()
+
+    assert github.stats["commits"] == 1
+    assert {queue.status(key)["state"] for key in keys} == {"done"}
+
+
+def test_batch_survives_server_errors_and_lost_responses():
+    github = FakeGitHub(fail_rate=0.2, drop_rate=0.15, latency=0.01, seed=3)
+    queue = UploadQueue("token", api=github.url, backoff=0.01, max_attempts=10, batch_seconds=0.2, batch_games=10)
+    keys = [f"gra{i}" for i in range(30)]
+    submit_batch(queue, keys)
+    queue.close()
+    github.close()
+
+    assert {queue.status(key)["state"] for key in keys} == {"done"}
+    results = github.results()
+    assert sorted(results.values()) == sorted(game_content(key) for key in keys)
+    assert all(results[queue.status(key)["path"]] == game_content(key) for key in keys)
+
+
+def test_etag_cache_keeps_only_refreshable_responses(github):
+    # Gałąź odświeżamy warunkowo; commity, odczyty z konkretnego commita (?ref=) i sprawdzenia plików po sha
+    # nie trafiają do pamięci
+    github.drop_next.add("PATCH")
+    queue = UploadQueue("token", api=github.url, backoff=0.01, batch_seconds=30, batch_games=1)
+    submit_batch(queue, [f"gra{i}" for i in range(12)])
+    queue.close()
+
+    cached = list(queue.client()._etags)
+    assert len(cached) <= wysylka.ETAG_CACHE_SIZE
+    assert not [url for url in cached if "/commits/" in url or "/gra" in url or "?ref=" in url]
+    assert any(url.endswith("/ref/heads/main") for url in cached)
@@ -0,0 +1,55 @@
+from collections import Counter
+
+import numpy as np
+import pytest
+
+from utils.symulator import simulate
+from utils.zasady import (
+    ROUND_SEQUENCE, responder_points, roles_2osobowy, roles_druzynowy, score_2osobowy, score_3osobowy,
+)
+
+
+@pytest.mark.parametrize("guesser, responder", [(0, 0), (2, 1), (3, 1), (4, 2)])
+def test_responder_points(guesser, responder):
+    assert responder_points(guesser) == responder
+    assert score_2osobowy(guesser) == (guesser, responder)
+
+
+def test_responder_points_on_arrays():
+    # Symulator liczy te same zasady na całych tablicach naraz
+    points = np.array([[0, 2, 3, 4]], dtype=np.int8)
+    assert responder_points(points).tolist() == [[0, 1, 1, 2]]
+
+
+@pytest.mark.parametrize("guesser, extra, responder", [(0, 0, 0), (0, 1, 1), (3, 0, 1), (3, 1, 2), (4, 1, 3)])
+def test_score_3osobowy_gives_responder_the_extra_point_bonus(guesser, extra, responder):
+    assert score_3osobowy(guesser, extra) == (guesser, extra, responder)
+
+
+def test_round_sequence_puts_everyone_in_every_role_twice():
+    # W każdym pytaniu trzy różne osoby, a w pełnej rundzie każdy gracz jest 2 razy w każdej roli
+    assert all(sorted(roles) == [0, 1, 2] for roles in ROUND_SEQUENCE)
+    for role in range(3):
+        assert Counter(roles[role] for roles in ROUND_SEQUENCE) == {0: 2, 1: 2, 2: 2}
+
+
+def test_other_modes_rotate_roles():
+    assert [roles_2osobowy(i) for i in range(4)] == [(0, 1), (1, 0), (0, 1), (1, 0)]
+    # Drużyny na zmianę, a w drużynie odpowiada kolejno każdy gracz (także przy różnych liczebnościach)
+    roles = [roles_druzynowy(i, (3, 2)) for i in range(12)]
+    assert Counter(team for team, _, _ in roles) == {0: 6, 1: 6}
+    assert [player for team, _, player in roles if team == 0] == [0, 1, 2, 0, 1, 2]
+    assert [player for team, _, player in roles if team == 1] == [0, 1, 0, 1, 0, 1]
+
+
+def test_simulate_is_seeded_and_fair_for_3osobowy():
+    first = simulate("3-osobowy", 20_000, 18, seed=7)
+    again = simulate("3-osobowy", 20_000, 18, seed=7)
+    assert np.array_equal(first["mean"], again["mean"])
+
+    # 3 rundy: każde miejsce 6 razy w każdej roli
+    assert first["roles"].tolist() == [[6, 6, 6]] * 3
+    # Na pytanie: zgadujący średnio 2,25 pkt, dodatkowy punkt 0,5, odpowiadający 1 + 0,5 - razem 8,5 na rundę
+    assert np.allclose(first["mean"], 3 * 8.5, atol=0.2)
+    assert first["wins"].sum() == pytest.approx(1.0)
+    assert 0 < first["ties"] < 1
@@ -0,0 +1,30 @@
+import importlib
+
+# ------------------------------
+# Rejestr trybów gry
+# ------------------------------
+#
+# Moduł trybu jest importowany dopiero, gdy ktoś go wybierze na ekranie trybów. Tryb opisuje tylko to,
+# czym różni się od innych; resztę (ekrany, punktacja, ekran końcowy, zapis wyników) robi utils.interfejs:
+#
+#   NAME                        - nazwa trybu (etykieta przycisku i GameState.mode)
+#   new_game()                  - nowy GameState trybu
+#   setup_screen(game)          - ekran wprowadzania graczy
+#   questions_per_round(game)   - ile pytań ma runda
+#   roles(game)                 - role w bieżącym pytaniu (słownik)
+#   roles_line(roles)           - wiersz "Odpowiada: ... | Zgaduje: ..."
+#   prompts(roles)              - (pytanie o punkty zgadujących, pytanie o punkt dodatkowy albo None)
+#   score(roles, q, guesser_points, extra_point, question_number, current_round)
+#                               - (pary (gracz/drużyna, punkty), wiersz wyników,
+#                                  trójki (nazwa sumy, gracz/drużyna, punkty) do podsumowań - GameState.ranked)
+#   end_summary(game)           - wyniki na ekranie końcowym
+
+MODES = {
+    "2-osobowy": "tryby.tryb_dwuosobowy",
+    "3-osobowy": "tryby.tryb_trojosobowy",
+    "Drużynowy": "tryby.tryb_druzynowy",
+}
+
+
+def load_mode(name):
+    return importlib.import_module(MODES[name])
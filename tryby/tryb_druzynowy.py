@@ -0,0 +1,236 @@
+import streamlit as st
+
+from utils.interfejs import back_to_mode_select, go_to
+from utils.stan_gry import GameState
+from utils.zasady import questions_per_round_druzynowy, roles_druzynowy, score_druzynowy
+
+# ------------------------------
+# Tryb drużynowy
+# ------------------------------
+
+NAME = "Drużynowy"
+
+DEFAULT_TEAM_NAMES = ["Niebiescy", "Czerwoni"]
+
+
+def new_game():
+    return GameState(NAME, team_names=list(DEFAULT_TEAM_NAMES), team_rosters=[["", ""], ["", ""]])
+
+# ------------------------------
+# Ekran drużyn
+# ------------------------------
+
+def team_sizes(game):
+    return [len([p for p in roster if p.strip()]) for roster in game.team_rosters]
+
+
+def valid_players_count(game):
+    len0, len1 = team_sizes(game)
+    return 2 <= len0 <= 7 and 2 <= len1 <= 7
+
+
+def valid_balance(game):
+    len0, len1 = team_sizes(game)
+    return -1 <= len0 - len1 <= 1
+
+
+def add_player(game, team_index):
+    game.team_rosters[team_index].append("")
+
+
+def confirm_teams(game):
+    # Nazwy i składy bierzemy prosto z pól - zmiana wpisana tuż przed kliknięciem też się liczy
+    for team_index in [0, 1]:
+        game.team_names[team_index] = st.session_state[f"team_name_{team_index}"]
+        roster = game.team_rosters[team_index]
+        for i in range(len(roster)):
+            roster[i] = st.session_state.get(f"player_{team_index}_{i}", roster[i]).strip()
+    if not (valid_players_count(game) and valid_balance(game)):
+        return
+
+    all_players = []
+    for team_index in [0, 1]:
+        team_key = game.team_names[team_index]
+        players_list = game.team_rosters[team_index]
+        for p in players_list:
+            if p.strip():
+                player = f"{p.strip()}_{team_key}"
+                all_players.append(player)
+    game.all_players = all_players
+
+    for p in all_players:
+        game.scores[p] = 0
+
+    for t in game.team_names:
+        game.scores[t] = 0
+
+    game.team_players = {
+        game.team_names[0]: [p for p in game.team_rosters[0] if p.strip()],
+        game.team_names[1]: [p for p in game.team_rosters[1] if p.strip()]
+        }
+    go_to("categories")
+
+
+def setup_screen(game):
+    st.header("🎭 Wprowadź nazwy drużyn i imiona graczy")
+
+    # Nazwy drużyn
+    col1, col2 = st.columns(2)
+    with col1:
+        game.team_names[0] = st.text_input("👫 Nazwa drużyny 1", value=game.team_names[0], key="team_name_0")
+    with col2:
+        game.team_names[1] = st.text_input("👫 Nazwa drużyny 2", value=game.team_names[1], key="team_name_1")
+
+    # Funkcja renderująca pola imion graczy
+    def render_players_inputs(team_index):
+        st.write(f"**Imiona graczy drużyny {game.team_names[team_index]}:**")
+        players_list = game.team_rosters[team_index]
+
+        for i, player_name in enumerate(players_list):
+            new_name = st.text_input(
+                f"🙋‍♂️ Imię {i + 1}. osoby z drużyny {game.team_names[team_index]}",
+                value=player_name,
+                key=f"player_{team_index}_{i}"
+            )
+            players_list[i] = new_name.strip()
+
+        if len(players_list) < 7:
+            st.button(
+                f"➕ Dodaj kolejnego gracza do drużyny {game.team_names[team_index]}", key=f"add_player_{team_index}",
+                on_click=add_player, args=(game, team_index),
+            )
+
+    col1, col2 = st.columns(2)
+    with col1:
+        render_players_inputs(0)
+    with col2:
+        render_players_inputs(1)
+
+    if not valid_players_count(game):
+        st.warning("⚠️ Każda drużyna musi mieć od 2 do 7 graczy.")
+    if not valid_balance(game):
+        st.warning("⚠️ Drużyny nie są zbalansowane. Maksymalna róznica to 1 gracz.")
+    len0, len1 = team_sizes(game)
+    if len0 - len1 == 1 or len0 - len1 == -1:
+        st.warning("⚠️ Drużyny nie są równe. Na pewno chcesz kontynuować?")
+
+    col1, col2 = st.columns([1, 1])
+    with col1:
+        st.button("🔙 Powrót", on_click=back_to_mode_select)
+    with col2:
+        if valid_players_count(game) and valid_balance(game):
+            st.button("✅ Dalej", on_click=confirm_teams, args=(game,))
+
+# ------------------------------
+# Role i punktacja
+# ------------------------------
+
+def questions_per_round(game):
+    # Runda kończy się, gdy każdy gracz większej drużyny raz odpowiadał
+    return questions_per_round_druzynowy([len(players) for players in game.team_players.values()])
+
+
+def roles(game):
+    # Drużyny odpowiadają na zmianę, a w drużynie kolejni gracze
+    sizes = [len(game.team_players[team]) for team in game.team_names]
+    team_index, other_index, player_index = roles_druzynowy(game.questions_asked, sizes)
+    responding_team, other_team = game.team_names[team_index], game.team_names[other_index]
+    responder = game.team_players[responding_team][player_index]
+    return {
+        "responder": responder,
+        "responding_team": responding_team,
+        "guessing_team": responding_team,
+        "other_team": other_team,
+    }
+
+
+def roles_line(roles):
+    return f"Odpowiada: **{roles['responder']}** &nbsp;&nbsp;&nbsp;|&nbsp;&nbsp;&nbsp; Zgadują: **{roles['guessing_team']}**"
+
+
+def prompts(roles):
+    return (
+        f"**Ile punktów zdobywają {roles['guessing_team']}?**",
+        f"**Dodatkowe punkty dla drużyny {roles['other_team']}?**",
+    )
+
+
+def player_key(player_name, team_name):
+    return f"{player_name}_{team_name.lower()}"
+
+
+def score(roles, q, guesser_points, extra_point, question_number, current_round):
+    responder = roles["responder"]
+    responding_team, guessing_team, other_team = roles["responding_team"], roles["guessing_team"], roles["other_team"]
+    guesser_points, extra_point, responder_points = score_druzynowy(guesser_points, extra_point)
+    player_id = player_key(responder, responding_team)
+
+    data_to_save = {
+        "runda": current_round,
+        "pytanie_nr": question_number,
+        "kategoria": q['categories'],
+        "pytanie": q['text'],
+        "odpowiada_drużyna": responding_team,
+        "zgaduje_drużyna": guessing_team,
+        "punkty_zgaduje": guesser_points,
+        "punkty_odpowiada": extra_point,
+        "odpowiada_gracz": responder,
+        "punkty_odpowiada_gracz": responder_points
+    }
+    points = [(guessing_team, guesser_points), (other_team, extra_point), (player_id, responder_points)]
+    # Sumy do ekranu końcowego liczone od razu przy zapisie (GameState.ranked)
+    tallies = [
+        ("zgadywanie", guessing_team, guesser_points),
+        ("dodatkowo", other_team, extra_point),
+        ("gracze", responder, responder_points),
+    ]
+    return points, data_to_save, tallies
+
+# ------------------------------
+# Ekran końcowy
+# ------------------------------
+
+def end_summary(game):
+    # --- WYNIKI DRUŻYN ---
+    # Dodatkowy punkt liczymy drużynie, która go dostała (druga drużyna), a nie odpowiadającej
+    team_names = set(game.team_names)
+    teams_scores = [(team, score) for team, score in game.ranked() if team in team_names]
+    guessing_points = game.tallies.get("zgadywanie", {})
+    extra_points = game.tallies.get("dodatkowo", {})
+
+    trophies = ["🏆", "🥈"]
+
+    for i, (team, score) in enumerate(teams_scores):
+        trophy = trophies[i] if i < len(trophies) else ""
+        odp = extra_points.get(team, 0)
+        zgad = guessing_points.get(team, 0)
+        st.write(f"{trophy} {team}: {score} punktów ({zgad} za zgadywanie + {odp} dodatkowo)")
+
+    # --- RANKING GRACZY ---
+    st.markdown("---")
+    st.header("🏅 Ranking graczy")
+
+    # Mapa gracz -> drużyna
+    player_to_team = {}
+    for team, players in game.team_players.items():
+        for p in players:
+            player_to_team[p] = team
+
+    # Punkty graczy sumowane przy każdym zapisie, już w kolejności rankingu
+    sorted_players = game.ranked("gracze")
+
+    if sorted_players:
+        for idx, (player, score) in enumerate(sorted_players, start=1):
+            team = player_to_team.get(player)
+            # Puchar wg drużyny: pierwsza drużyna 🏆, druga 🥈
+            if team == game.team_names[0]:
+                player_trophy = "🏆"
+            elif team == game.team_names[1]:
+                player_trophy = "🥈"
+            else:
+                player_trophy = ""
+
+            st.write(f"{idx}. {player_trophy} **{player}** - {score} punktów")
+
+    else:
+        st.write("Brak danych o graczach odpowiadających na pytania.")
@@ -0,0 +1,70 @@
+from utils.interfejs import player_ranking, players_setup
+from utils.stan_gry import GameState
+from utils.zasady import ROUND_SEQUENCE, roles_3osobowy, score_3osobowy
+
+# ------------------------------
+# Tryb 3-osobowy
+# ------------------------------
+
+NAME = "3-osobowy"
+
+
+def new_game():
+    return GameState(NAME, players=["", "", ""])
+
+
+def setup_screen(game):
+    players_setup(game)
+
+
+def questions_per_round(game):
+    return len(ROUND_SEQUENCE)
+
+
+def roles(game):
+    role_indices = roles_3osobowy(game.questions_asked)
+    responder, guesser, direction_guesser = (game.all_players[i] for i in role_indices)
+    return {"responder": responder, "guesser": guesser, "direction_guesser": direction_guesser}
+
+
+def roles_line(roles):
+    return f"Odpowiada: **{roles['responder']}** &nbsp;&nbsp;&nbsp;|&nbsp;&nbsp;&nbsp; Zgaduje: **{roles['guesser']}**"
+
+
+def prompts(roles):
+    return (
+        f"**Ile punktów zdobywa {roles['guesser']}?**",
+        f"**Czy {roles['direction_guesser']} zdobywa dodatkowy punkt?**",
+    )
+
+
+def score(roles, q, guesser_points, extra_point, question_number, current_round):
+    responder, guesser, direction_guesser = roles["responder"], roles["guesser"], roles["direction_guesser"]
+
+    # Liczenie punktów globalnych
+    guesser_points, extra_point, bonus = score_3osobowy(guesser_points, extra_point)
+
+    points_this_round = {
+        responder: bonus,
+        guesser: guesser_points,
+        direction_guesser: extra_point
+    }
+
+    # DOPISYWANIE WYNIKÓW DO LISTY W PAMIĘCI
+    data_to_save = {
+        "r_pytania": question_number,
+        "kategoria": q['categories'],
+        "pytanie": q['text'],
+        "odpowiada": responder,
+        "zgaduje": guesser,
+        "dodatkowo": direction_guesser,
+        responder: points_this_round[responder],
+        guesser: points_this_round[guesser],
+        direction_guesser: points_this_round[direction_guesser],
+    }
+    points = [(guesser, guesser_points), (direction_guesser, extra_point), (responder, bonus)]
+    return points, data_to_save, []
+
+
+def end_summary(game):
+    player_ranking(game)
@@ -0,0 +1,342 @@
+import json
+import mmap
+import os
+import re
+import shutil
+import struct
+import tempfile
+import time
+from array import array
+
+# ------------------------------
+# Binarny format banku pytań
+# ------------------------------
+#
+# Bank to katalog questions.bank/ z wersjami (nazwa = początek hasha źródłowego CSV):
+#   CURRENT              - nazwa aktualnej wersji (podmieniany atomowo)
+#   <wersja>/manifest.json - kategorie (tagi), liczby pytań i pliki shardów
+#   <wersja>/NN.bin      - shard jednej kategorii (pytania, których pierwszym tagiem jest ta kategoria)
+#   <wersja>/NN.idx      - opcjonalny indeks wyszukiwania sharda (z kompilatora)
+#   <wersja>/tags.bin    - maski bitowe tagów wszystkich pytań (uint64 × n, w kolejności numerów pytań)
+#   <wersja>/.leases/    - znaczniki użycia wersji (np. przez grę w dzienniku) - prune_bank ich nie rusza
+#
+# Shard:  nagłówek | metadane JSON | id (uint32 × n) | offsety (uint32 × n+1) | teksty UTF-8
+# Indeks: nagłówek | lista termów JSON | offsety (uint32 × t+1) | pozycje pytań w shardzie (uint32)
+#
+# Id pytania "fun001" zapisujemy jako liczbę: kod prefiksu w górnych 8 bitach, numer w dolnych 24.
+# Shardy są mapowane w pamięć tylko do odczytu, więc kilka procesów na jednym hoście
+# współdzieli te same strony pamięci, a teksty dekodujemy dopiero przy wyświetlaniu.
+
+MAGIC = b"SPQB"
+INDEX_MAGIC = b"SPQI"
+VERSION = 3
+MAX_TAGS = 64
+
+LEASES_DIR = ".leases"
+# Po jakim czasie nieodnawiany znacznik przestaje chronić wersję (np. porzucona gra w dzienniku)
+LEASE_TTL_SECONDS = 3 * 24 * 3600
+
+_HEADER = struct.Struct("<4sHHII")  # magic, wersja, zarezerwowane, liczba pytań, długość metadanych
+_ID_RE = re.compile(r"^(\D+)(\d+)$")
+
+
+def _align(pos, to=4):
+    return (pos + to - 1) // to * to
+
+
+def encode_id(qid, prefixes):
+    # prefixes: prefiks -> [kod, liczba cyfr], uzupełniany o nowe prefiksy
+    match = _ID_RE.match(qid)
+    if not match:
+        raise ValueError(f"Niepoprawne id pytania: {qid!r}")
+    prefix, digits = match.groups()
+    code, width = prefixes.setdefault(prefix, [len(prefixes), len(digits)])
+    if len(digits) != width or int(digits) >= 1 << 24 or code >= 1 << 8:
+        raise ValueError(f"Id pytania nie pasuje do formatu banku: {qid!r}")
+    return code << 24 | int(digits)
+
+
+def decode_id(value, prefixes):
+    prefix, width = prefixes[value >> 24]
+    return f"{prefix}{value & 0xFFFFFF:0{width}d}"
+
+
+# ------------------------------
+# Zapis
+# ------------------------------
+
+class ShardWriter:
+    # Strumieniowy zapis jednego sharda: teksty od razu trafiają do pliku tymczasowego,
+    # w pamięci zostają tylko tablice id i offsetów (8 bajtów na pytanie).
+    def __init__(self, path, category, index_terms=None):
+        self.path = path
+        self.category = category
+        self.index_path = os.path.splitext(path)[0] + ".idx" if index_terms else None
+        self._index_terms = index_terms
+        self._postings = {}
+        self._prefixes = {}
+        self.masks = array("Q")
+        self.tags_union = 0
+        self._ids = array("I")
+        self._offsets = array("I", [0])
+        self._size = 0
+        self._blob = tempfile.TemporaryFile(dir=os.path.dirname(path))
+
+    def __len__(self):
+        return len(self._ids)
+
+    def add(self, qid, text, mask):
+        self.masks.append(mask)
+        self.tags_union |= mask
+        if self._index_terms is not None:
+            for term in self._index_terms(text):
+                self._postings.setdefault(term, array("I")).append(len(self._ids))
+        self._ids.append(encode_id(qid, self._prefixes))
+        data = text.encode("utf-8")
+        self._blob.write(data)
+        self._size += len(data)
+        self._offsets.append(self._size)
+
+    def close(self):
+        prefixes = [[prefix, width] for prefix, (code, width) in sorted(self._prefixes.items(), key=lambda kv: kv[1][0])]
+        meta = json.dumps({"category": self.category, "prefixes": prefixes}, ensure_ascii=False).encode("utf-8")
+        with open(self.path, "wb") as f:
+            f.write(_HEADER.pack(MAGIC, VERSION, 0, len(self._ids), len(meta)))
+            f.write(meta)
+            f.write(b"\0" * (_align(f.tell()) - f.tell()))
+            f.write(self._ids.tobytes())
+            f.write(self._offsets.tobytes())
+            self._blob.seek(0)
+            shutil.copyfileobj(self._blob, f)
+        self._blob.close()
+        if self.index_path is not None:
+            write_index(self.index_path, self._postings)
+
+
+def write_index(path, postings):
+    terms = sorted(postings)
+    offsets = array("I", [0])
+    data = array("I")
+    for term in terms:
+        data.extend(postings[term])
+        offsets.append(len(data))
+    meta = json.dumps(terms, ensure_ascii=False).encode("utf-8")
+    with open(path, "wb") as f:
+        f.write(_HEADER.pack(INDEX_MAGIC, VERSION, 0, len(terms), len(meta)))
+        f.write(meta)
+        f.write(b"\0" * (_align(f.tell()) - f.tell()))
+        f.write(offsets.tobytes())
+        f.write(data.tobytes())
+
+
+def write_bank(bank_dir, rows, category_names=(), source_hash=None, index_terms=None):
+    # rows: strumień krotek (id, tekst, tagi) - nic nie jest trzymane w całości w pamięci.
+    # Pierwszy tag wyznacza shard pytania, wszystkie trafiają do jego maski bitowej.
+    # index_terms: funkcja tekst -> termy; jeśli podana, obok shardów powstają indeksy wyszukiwania.
+    version = (source_hash or "bank")[:12] + ("-idx" if index_terms else "")
+    version_dir = os.path.join(bank_dir, version)
+    tmp_dir = tempfile.mkdtemp(prefix=f".{version}.", dir=_ensure_dir(bank_dir))
+
+    order = list(category_names)
+    codes = {tag: code for code, tag in enumerate(order)}
+
+    def tag_code(tag):
+        code = codes.get(tag)
+        if code is None:
+            if len(order) >= MAX_TAGS:
+                raise ValueError(f"Za dużo kategorii w banku (maksymalnie {MAX_TAGS})")
+            code = codes[tag] = len(order)
+            order.append(tag)
+        return code
+
+    writers = {}
+    try:
+        for qid, text, tags in rows:
+            if not tags:
+                raise ValueError(f"Pytanie {qid!r} nie ma kategorii")
+            mask = 0
+            for tag in tags:
+                mask |= 1 << tag_code(tag)
+            primary = tag_code(tags[0])
+            writer = writers.get(primary)
+            if writer is None:
+                path = os.path.join(tmp_dir, f"{primary:02d}.bin")
+                writer = writers[primary] = ShardWriter(path, tags[0], index_terms)
+            writer.add(qid, text, mask)
+
+        shards = []
+        with open(os.path.join(tmp_dir, "tags.bin"), "wb") as tags_file:
+            for code, category in enumerate(order):
+                writer = writers.get(code)
+                if writer is not None:
+                    writer.close()
+                    tags_file.write(writer.masks.tobytes())
+                shards.append({
+                    "category": category,
+                    "count": len(writer) if writer is not None else 0,
+                    "file": os.path.basename(writer.path) if writer is not None else None,
+                    "index": os.path.basename(writer.index_path) if writer is not None and writer.index_path else None,
+                    "tags": writer.tags_union if writer is not None else 0,
+                })
+        with open(os.path.join(tmp_dir, "manifest.json"), "w", encoding="utf-8") as f:
+            manifest = {"version": VERSION, "source_hash": source_hash, "shards": shards, "tags_file": "tags.bin"}
+            json.dump(manifest, f, ensure_ascii=False)
+    except BaseException:
+        # Niepełna wersja nie może zostać w katalogu banku
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+
+    # Katalog wersji i wskaźnik CURRENT podmieniamy atomowo - czytelnicy widzą starą albo nową wersję
+    if os.path.isdir(version_dir):
+        shutil.rmtree(tmp_dir)
+        os.utime(version_dir)
+    else:
+        try:
+            os.replace(tmp_dir, version_dir)
+        except OSError:
+            # Inny proces skompilował tę samą wersję w tym samym czasie (katalog nie jest już pusty) -
+            # treść jest ta sama, więc zostaje jego katalog
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            if not os.path.isdir(version_dir):
+                raise
+    tmp_pointer = os.path.join(bank_dir, f".CURRENT.{os.getpid()}")
+    with open(tmp_pointer, "w", encoding="utf-8") as f:
+        f.write(version)
+    os.replace(tmp_pointer, os.path.join(bank_dir, "CURRENT"))
+    return version_dir
+
+
+def prune_bank(bank_dir, keep=2, lease_ttl=LEASE_TTL_SECONDS):
+    # Usuwa najstarsze wersje poza tymi z aktualnym znacznikiem użycia. Otwarty QuestionStore mapuje
+    # wszystkie pliki swojej wersji od razu, więc w procesach, które go trzymają, usunięcie jest bezpieczne
+    current = current_version_dir(bank_dir)
+    versions = [
+        os.path.join(bank_dir, name) for name in os.listdir(bank_dir)
+        if not name.startswith(".") and os.path.isdir(os.path.join(bank_dir, name))
+        and os.path.join(bank_dir, name) != current
+    ]
+    versions.sort(key=os.path.getmtime, reverse=True)
+    for path in versions[keep - 1:]:
+        if not _leased(path, lease_ttl):
+            shutil.rmtree(path, ignore_errors=True)
+
+
+def lease_version(version_dir, holder):
+    # Znacznik "wersja jest jeszcze potrzebna" od holder (np. id gry); ponowne wywołanie go odnawia
+    path = os.path.join(_ensure_dir(os.path.join(version_dir, LEASES_DIR)), holder)
+    with open(path, "a"):
+        pass
+    os.utime(path)
+
+
+def release_version(version_dir, holder):
+    try:
+        os.remove(os.path.join(version_dir, LEASES_DIR, holder))
+    except FileNotFoundError:
+        pass
+
+
+def _leased(version_dir, lease_ttl):
+    oldest = time.time() - lease_ttl
+    try:
+        with os.scandir(os.path.join(version_dir, LEASES_DIR)) as entries:
+            return any(entry.stat().st_mtime > oldest for entry in entries)
+    except FileNotFoundError:
+        return False
+
+
+def _ensure_dir(path):
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+# ------------------------------
+# Odczyt
+# ------------------------------
+
+def current_version_dir(bank_dir):
+    with open(os.path.join(bank_dir, "CURRENT"), encoding="utf-8") as f:
+        return os.path.join(bank_dir, f.read().strip())
+
+
+def read_manifest(version_dir):
+    with open(os.path.join(version_dir, "manifest.json"), encoding="utf-8") as f:
+        manifest = json.load(f)
+    if manifest.get("version") != VERSION:
+        raise ValueError(f"Nieobsługiwana wersja banku pytań: {version_dir}")
+    return manifest
+
+
+def map_file(path):
+    with open(path, "rb") as f:
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def map_array(path):
+    # Zmapowany plik jako memoryview bajtów; pusty plik nie da się zmapować, więc zwracamy pusty bufor
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return memoryview(b"")
+        return memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
+
+class BankShard:
+    # Zmapowany shard jednej kategorii
+    __slots__ = ("category", "_mm", "_prefixes", "_ids", "_offsets", "_blob")
+
+    def __init__(self, path):
+        self._mm = map_file(path)
+
+        magic, version, _, count, meta_len = _HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"Nieobsługiwany plik banku pytań: {path}")
+
+        pos = _HEADER.size
+        meta = json.loads(self._mm[pos:pos + meta_len].decode("utf-8"))
+        pos = _align(pos + meta_len)
+        self.category = meta["category"]
+        self._prefixes = meta["prefixes"]
+
+        buf = memoryview(self._mm)
+        self._ids = buf[pos:pos + 4 * count].cast("I")
+        pos += 4 * count
+        self._offsets = buf[pos:pos + 4 * (count + 1)].cast("I")
+        pos += 4 * (count + 1)
+        self._blob = buf[pos:]
+
+    def __len__(self):
+        return len(self._ids)
+
+    def id(self, index):
+        return decode_id(self._ids[index], self._prefixes)
+
+    def text(self, index):
+        return str(self._blob[self._offsets[index]:self._offsets[index + 1]], "utf-8")
+
+
+class ShardIndex:
+    # Zmapowany indeks wyszukiwania jednego sharda: term -> pozycje pytań w shardzie
+    __slots__ = ("_mm", "_terms", "_offsets", "_postings")
+
+    # mm: plik zmapowany wcześniej (QuestionStore mapuje indeksy przy otwarciu wersji)
+    def __init__(self, path, mm=None):
+        self._mm = map_file(path) if mm is None else mm
+
+        magic, version, _, count, meta_len = _HEADER.unpack_from(self._mm, 0)
+        if magic != INDEX_MAGIC or version != VERSION:
+            raise ValueError(f"Nieobsługiwany plik indeksu pytań: {path}")
+
+        pos = _HEADER.size
+        self._terms = {term: i for i, term in enumerate(json.loads(self._mm[pos:pos + meta_len].decode("utf-8")))}
+        pos = _align(pos + meta_len)
+
+        buf = memoryview(self._mm)
+        self._offsets = buf[pos:pos + 4 * (count + 1)].cast("I")
+        pos += 4 * (count + 1)
+        self._postings = buf[pos:].cast("I")
+
+    def get(self, term, default=()):
+        i = self._terms.get(term)
+        if i is None:
+            return default
+        return self._postings[self._offsets[i]:self._offsets[i + 1]]
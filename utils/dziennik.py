@@ -0,0 +1,205 @@
+import atexit
+import json
+import logging
+import os
+import queue
+import re
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+import streamlit as st
+
+from utils.bank_pytan import LEASE_TTL_SECONDS, lease_version, release_version
+from utils.pytania import QUESTIONS_PATH
+from utils.stan_gry import GameState
+
+# ------------------------------
+# Dziennik gier (wznawianie po utracie sesji)
+# ------------------------------
+#
+# Każda gra ma w katalogu dziennika dwa pliki:
+#   <id>.jsonl          - zdarzenia dopisywane na końcu ({"seq": 7, "type": "score", ...})
+#   <id>.snapshot.json  - ostatni zrzut stanu gry i pozycja w .jsonl, od której trzeba odtwarzać
+# Wznowienie czyta zrzut i co najwyżej SNAPSHOT_EVERY zdarzeń po nim, niezależnie od długości gry.
+# Pliki gry znikają, gdy gra jest zakończona i wysłana, a pozostałe (np. bez tokenu GitHuba albo porzucone)
+# po GAME_TTL_SECONDS od ostatniego zapisu - tyle samo żyje znacznik wersji banku, którą wskazuje zrzut.
+
+JOURNAL_PATH = os.path.join(os.path.dirname(QUESTIONS_PATH), "dziennik_gier")
+
+# Co ile zdarzeń zapisujemy nowy zrzut stanu
+SNAPSHOT_EVERY = 20
+# Ile plików dziennika trzymamy jednocześnie otwartych
+MAX_OPEN_FILES = 16
+# Po jakim czasie bez zapisu gra wypada z dziennika i jak często (najwyżej) tego szukamy
+GAME_TTL_SECONDS = LEASE_TTL_SECONDS
+SWEEP_EVERY_SECONDS = 3600
+
+logger = logging.getLogger(__name__)
+
+_GAME_ID = re.compile(r"[0-9a-f]{12}")
+
+
+class GameJournal:
+    # Zapis odbywa się w osobnym wątku: ekran gry tylko wrzuca zdarzenie do kolejki i nie czeka na dysk.
+    # Kolejka zachowuje kolejność, więc zrzut zawsze obejmuje wszystkie zdarzenia dodane przed nim.
+    def __init__(self, directory=JOURNAL_PATH, snapshot_every=SNAPSHOT_EVERY, ttl=GAME_TTL_SECONDS):
+        self.directory = directory
+        self.snapshot_every = snapshot_every
+        self.ttl = ttl
+        os.makedirs(directory, exist_ok=True)
+        self._queue = queue.Queue()
+        self._files = OrderedDict()
+        self._removed = set()  # gry, których pliki usunęliśmy - kolejne zdarzenie zaczyna je od zrzutu
+        self._swept_at = time.monotonic()
+        self._queue.put(("sweep", None, None))
+        self._thread = threading.Thread(target=self._run, name="dziennik-gier", daemon=True)
+        self._thread.start()
+        atexit.register(self.flush)
+
+    def _path(self, game_id, suffix):
+        return os.path.join(self.directory, f"{game_id}{suffix}")
+
+    def start(self, game):
+        game.game_id = uuid.uuid4().hex[:12]
+        game.journal_seq = 0
+        self.snapshot(game)
+        if time.monotonic() - self._swept_at >= SWEEP_EVERY_SECONDS:
+            self._swept_at = time.monotonic()
+            self._queue.put(("sweep", None, None))
+        return game.game_id
+
+    def append(self, game, event):
+        if game.game_id is None:
+            return
+        game.journal_seq += 1
+        self._queue.put(("event", game.game_id, {"seq": game.journal_seq, **event}))
+        if game.finished and game.results_uploaded:
+            # Wyniki są już na GitHubie - wznawiać nie ma czego
+            if game.game_id not in self._removed:
+                self._removed.add(game.game_id)
+                self._queue.put(("remove", game.game_id, None))
+        elif game.journal_seq % self.snapshot_every == 0 or game.game_id in self._removed:
+            # Gra grana dalej po usunięciu plików (np. "Jeszcze nie kończymy!") zaczyna dziennik od nowa
+            self._removed.discard(game.game_id)
+            self.snapshot(game)
+
+    def snapshot(self, game):
+        # Sam zrzut do słownika robimy od razu (stan zaraz się zmieni), serializację - już w tle
+        self._queue.put(("snapshot", game.game_id, {"seq": game.journal_seq, "state": game.snapshot()}))
+
+    def flush(self):
+        self._queue.join()
+
+    def resume(self, game_id, store=None):
+        # Zwraca odtworzony stan gry albo None, jeśli gry nie ma w dzienniku (lub jej bank już usunięto);
+        # store jak w GameState.restore
+        if not _GAME_ID.fullmatch(game_id or ""):
+            return None
+        self.flush()
+        try:
+            with open(self._path(game_id, ".snapshot.json"), encoding="utf-8") as f:
+                snapshot = json.load(f)
+            game = GameState.restore(snapshot["state"], store)
+        except (OSError, ValueError, KeyError):
+            return None
+
+        try:
+            with open(self._path(game_id, ".jsonl"), "rb") as f:
+                f.seek(snapshot["offset"])
+                lines = f.read().splitlines()
+        except OSError:
+            lines = []
+        for line in lines:
+            try:
+                event = json.loads(line)
+            except ValueError:
+                break  # niedopisany ostatni wiersz
+            if event["seq"] > game.journal_seq:
+                game.apply(event)
+                game.journal_seq = event["seq"]
+        return game
+
+    def _file(self, game_id):
+        f = self._files.get(game_id)
+        if f is None:
+            f = self._files[game_id] = open(self._path(game_id, ".jsonl"), "a", encoding="utf-8")
+            while len(self._files) > MAX_OPEN_FILES:
+                self._files.popitem(last=False)[1].close()
+        else:
+            self._files.move_to_end(game_id)
+        return f
+
+    def _write(self, kind, game_id, data):
+        if kind == "remove":
+            self._remove(game_id)
+            return
+        if kind == "sweep":
+            self._sweep()
+            return
+        f = self._file(game_id)
+        if kind == "event":
+            f.write(json.dumps(data, ensure_ascii=False) + "\n")
+            return
+        f.flush()
+        data["offset"] = f.tell()
+        # Wersja banku ze zrzutu musi przetrwać przeładowania questions.csv, dopóki gra jest w dzienniku
+        used = data["state"].get("used")
+        if used is not None:
+            lease_version(used["bank"], game_id)
+        path = self._path(game_id, ".snapshot.json")
+        with open(path + ".tmp", "w", encoding="utf-8") as out:
+            json.dump(data, out, ensure_ascii=False)
+        os.replace(path + ".tmp", path)
+
+    def _remove(self, game_id):
+        f = self._files.pop(game_id, None)
+        if f is not None:
+            f.close()
+        try:
+            with open(self._path(game_id, ".snapshot.json"), encoding="utf-8") as snapshot:
+                used = json.load(snapshot)["state"].get("used")
+            if used is not None:
+                release_version(used["bank"], game_id)
+        except (OSError, ValueError, KeyError):
+            pass  # bez zrzutu znacznik wersji banku i tak wygaśnie
+        for suffix in (".snapshot.json", ".jsonl"):
+            try:
+                os.remove(self._path(game_id, suffix))
+            except FileNotFoundError:
+                pass
+
+    def _sweep(self):
+        # Gry bez zapisu od ttl sekund: zakończone bez wysyłki albo porzucone w trakcie
+        oldest = time.time() - self.ttl
+        last_write = {}
+        with os.scandir(self.directory) as entries:
+            for entry in entries:
+                game_id = entry.name.split(".", 1)[0]
+                if _GAME_ID.fullmatch(game_id):
+                    last_write[game_id] = max(last_write.get(game_id, 0), entry.stat().st_mtime)
+        for game_id, mtime in last_write.items():
+            if mtime < oldest:
+                self._remove(game_id)
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            try:
+                self._write(*item)
+                # Pliki opróżniamy dopiero, gdy kolejka jest pusta - kilka zdarzeń naraz to jeden zapis
+                if self._queue.empty():
+                    for f in self._files.values():
+                        f.flush()
+            except Exception as e:
+                # Dziennik jest pomocniczy - błąd zapisu nie może zatrzymać gry ani wątku
+                # (bez niego flush() czekałby w nieskończoność)
+                logger.warning("Błąd zapisu dziennika gier (%s %s): %s", item[0], item[1], e)
+            finally:
+                self._queue.task_done()
+
+
+@st.cache_resource
+def get_journal():
+    return GameJournal()
@@ -0,0 +1,232 @@
+import csv
+import importlib.util
+import io
+import json
+import os
+import sys
+
+import xlsxwriter
+
+from utils.zasady import ROUND_SEQUENCE
+
+# ------------------------------
+# Eksport wyników gry
+# ------------------------------
+#
+# Wiersze wyników idą do arkusza jeden po drugim (xlsxwriter w trybie constant_memory) - bez pandas
+# i bez budowania całej tabeli w pamięci. Kolumny i nagłówek jak w dawnym pd.DataFrame(results_data).to_excel.
+#
+# CSV, JSON Lines i Parquet mają jeden schemat "długi" dla wszystkich trybów (LONG_COLUMNS): wiersz na każde
+# przyznane punkty zamiast kolumn z imionami graczy, więc tysiące gier czyta się jako jeden zbiór danych.
+# Stare pliki z wyniki/ można przepisać do tego schematu:
+#
+#   python -m utils.eksport wyniki/*.xlsx --format parquet --out wyniki.parquet
+
+SHEET_NAME = "Wyniki"
+
+# (kolumna, typ) - kolejność i typy są stałe niezależnie od trybu i graczy
+LONG_COLUMNS = (
+    ("gra", str),  # id gry z dziennika albo nazwa pliku z archiwum
+    ("tryb", str),
+    ("pytanie_nr", int),
+    ("runda", int),
+    ("kategoria", str),
+    ("pytanie", str),
+    ("odpowiada", str),  # gracz odpowiadający
+    ("zgaduje", str),  # gracz albo drużyna zgadująca
+    ("zdobywca", str),  # kto dostaje punkty (gracz albo drużyna)
+    ("druzyna", str),  # drużyna zdobywcy, pusta poza trybem drużynowym
+    ("rola", str),  # "zgadywanie", "odpowiadanie" albo "dodatkowo"
+    ("punkty", int),
+)
+
+
+def result_columns(rows):
+    # Kolumny w kolejności pierwszego wystąpienia (jak pd.DataFrame z listy słowników) - każdy tryb
+    # ma swoje: 2/3-osobowy dokłada kolumny z imionami graczy, drużynowy ma stały zestaw
+    columns = {}
+    for row in rows:
+        for key in row:
+            columns.setdefault(key, None)
+    return list(columns)
+
+
+def write_xlsx(rows, output, columns=None):
+    # output to ścieżka albo obiekt plikowy (BytesIO, otwarty plik, gniazdo przez makefile("wb")).
+    # Przy strumieniu wierszy (np. z archiwum) podaj columns - inaczej wiersze trzeba przejrzeć dwa razy
+    if columns is None:
+        rows = rows if isinstance(rows, list) else list(rows)
+        columns = result_columns(rows)
+
+    workbook = xlsxwriter.Workbook(output, {"constant_memory": True})
+    sheet = workbook.add_worksheet(SHEET_NAME)
+    header = workbook.add_format({"bold": True, "border": 1, "align": "center", "valign": "top"})
+    sheet.write_row(0, 0, columns, header)
+    for row_number, row in enumerate(rows, start=1):
+        # Brak wartości (kolumna innego gracza) zostaje pustą komórką, jak NaN w pandas
+        sheet.write_row(row_number, 0, [row.get(key) for key in columns])
+    workbook.close()
+
+
+# ------------------------------
+# Schemat długi
+# ------------------------------
+
+def _record(game_id, mode, number, round_number, row, responder, guesser, winner, team, role, points):
+    return {
+        "gra": game_id,
+        "tryb": mode,
+        "pytanie_nr": int(number),
+        "runda": int(round_number),
+        "kategoria": row.get("kategoria") or "",
+        "pytanie": row.get("pytanie") or "",
+        "odpowiada": responder,
+        "zgaduje": guesser,
+        "zdobywca": winner,
+        "druzyna": team,
+        "rola": role,
+        "punkty": int(points or 0),
+    }
+
+
+def long_records(rows, game_id="", team_names=None):
+    # Układ wiersza rozpoznajemy po kolumnach, więc działa tak samo dla gry w pamięci i pliku z archiwum;
+    # bez team_names drużyny zbieramy z wierszy (druga drużyna dostaje punkt dodatkowy)
+    if team_names is None:
+        rows = rows if isinstance(rows, list) else list(rows)
+        team_names = list(dict.fromkeys(row["odpowiada_drużyna"] for row in rows if "odpowiada_drużyna" in row))
+
+    for row in rows:
+        if "odpowiada_drużyna" in row:
+            team, guessing_team = row["odpowiada_drużyna"], row["zgaduje_drużyna"]
+            other_team = next((t for t in team_names if t != team), "")
+            responder = row.get("odpowiada_gracz") or ""
+            common = (game_id, "Drużynowy", row["pytanie_nr"], row["runda"], row, responder, guessing_team)
+            yield _record(*common, guessing_team, guessing_team, "zgadywanie", row.get("punkty_zgaduje"))
+            yield _record(*common, other_team, other_team, "dodatkowo", row.get("punkty_odpowiada"))
+            yield _record(*common, responder, team, "odpowiadanie", row.get("punkty_odpowiada_gracz"))
+            continue
+
+        number = row["r_pytania"]
+        responder, guesser = row["odpowiada"], row["zgaduje"]
+        if "dodatkowo" in row:
+            mode, per_round = "3-osobowy", len(ROUND_SEQUENCE)
+        else:
+            mode, per_round = "2-osobowy", 2
+        common = (game_id, mode, number, (int(number) - 1) // per_round + 1, row, responder, guesser)
+        yield _record(*common, guesser, "", "zgadywanie", row.get(guesser))
+        if mode == "3-osobowy":
+            yield _record(*common, row["dodatkowo"], "", "dodatkowo", row.get(row["dodatkowo"]))
+        yield _record(*common, responder, "", "odpowiadanie", row.get(responder))
+
+
+def write_csv(records, output):
+    text = io.TextIOWrapper(output, encoding="utf-8", newline="")
+    writer = csv.DictWriter(text, fieldnames=[name for name, _ in LONG_COLUMNS])
+    writer.writeheader()
+    writer.writerows(records)
+    text.flush()
+    text.detach()  # output zostaje otwarty dla wywołującego
+
+
+def write_jsonl(records, output):
+    for record in records:
+        output.write(json.dumps(record, ensure_ascii=False).encode("utf-8") + b"\n")
+
+
+PARQUET_BATCH_ROWS = 65_536
+
+
+def write_parquet(records, output):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    types = {str: pa.string(), int: pa.int64()}
+    schema = pa.schema([(name, types[kind]) for name, kind in LONG_COLUMNS])
+    with pq.ParquetWriter(output, schema) as writer:
+        batch, written = [], False
+        for record in records:
+            batch.append(record)
+            if len(batch) == PARQUET_BATCH_ROWS:
+                writer.write_table(pa.Table.from_pylist(batch, schema=schema))
+                batch, written = [], True
+        if batch or not written:
+            writer.write_table(pa.Table.from_pylist(batch, schema=schema))
+
+
+# ------------------------------
+# Formaty
+# ------------------------------
+
+FORMATS = {
+    "xlsx": {
+        "label": "XLSX", "extension": "xlsx", "long": False, "writer": write_xlsx,
+        "mime": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    },
+    "csv": {"label": "CSV", "extension": "csv", "long": True, "writer": write_csv, "mime": "text/csv"},
+    "jsonl": {
+        "label": "JSON Lines", "extension": "jsonl", "long": True, "writer": write_jsonl,
+        "mime": "application/x-ndjson",
+    },
+    "parquet": {
+        "label": "Parquet", "extension": "parquet", "long": True, "writer": write_parquet,
+        "mime": "application/vnd.apache.parquet", "requires": "pyarrow",
+    },
+}
+
+
+def available_formats():
+    # Parquet tylko z zainstalowanym pyarrow - bez importowania go
+    return [name for name, spec in FORMATS.items()
+            if "requires" not in spec or importlib.util.find_spec(spec["requires"]) is not None]
+
+
+def write_results(rows, output, fmt="xlsx", game_id="", team_names=None):
+    spec = FORMATS[fmt]
+    if spec["long"]:
+        spec["writer"](long_records(rows, game_id, team_names), output)
+    else:
+        spec["writer"](rows, output)
+
+
+# ------------------------------
+# Przepisywanie archiwum
+# ------------------------------
+
+def read_xlsx_rows(path):
+    import openpyxl
+
+    workbook = openpyxl.load_workbook(path, read_only=True)
+    try:
+        values = workbook.worksheets[0].values
+        header = next(values, None)
+        if header is None:
+            return []
+        return [{key: value for key, value in zip(header, row) if value is not None} for row in values]
+    finally:
+        workbook.close()
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="python -m utils.eksport", description="Wyniki gier w schemacie długim")
+    parser.add_argument("files", nargs="+", help="pliki XLSX z wynikami (np. wyniki/*.xlsx)")
+    parser.add_argument("--format", choices=[name for name, spec in FORMATS.items() if spec["long"]],
+                        default="parquet")
+    parser.add_argument("--out", required=True)
+    args = parser.parse_args(argv)
+
+    def records():
+        for path in args.files:
+            game_id = os.path.splitext(os.path.basename(path))[0]
+            yield from long_records(read_xlsx_rows(path), game_id)
+
+    with open(args.out, "wb") as output:
+        FORMATS[args.format]["writer"](records(), output)
+    print(f"✅ {len(args.files)} plików -> {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,67 @@
+import os
+import re
+import subprocess
+import sys
+
+# ------------------------------
+# Raport czasu importu przy starcie aplikacji
+# ------------------------------
+#
+# Importuje w osobnym procesie to, co streamlit_app.py ładuje przy starcie, z python -X importtime,
+# i podaje łączny czas importu w podziale na pakiety oraz ciężkie pakiety, które weszły przy starcie:
+#
+#   python -m utils.importy [--all]
+
+# Moduły importowane przez streamlit_app.py przed narysowaniem pierwszego ekranu
+STARTUP_MODULES = ("streamlit", "tryby", "utils.interfejs")
+
+# Pakiety, które powinny się ładować dopiero przy pierwszym użyciu (ekran końcowy, zapis wyników)
+DEFERRED_PACKAGES = ("pandas", "requests", "xlsxwriter", "openpyxl", "matplotlib")
+
+_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)")
+
+
+def measure(modules=STARTUP_MODULES):
+    # Zwraca listę (pakiet, łączny czas w ms) dla importów najwyższego poziomu
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    code = "; ".join(f"import {name}" for name in modules)
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=root, capture_output=True, text=True, check=True,
+    )
+    totals = {}
+    for line in result.stderr.splitlines():
+        match = _LINE.match(line)
+        if match is None or match.group(3):
+            continue  # import zagnieżdżony - liczy się w czasie importu, który go wywołał
+        package = match.group(4).split(".")[0]
+        totals[package] = totals.get(package, 0) + int(match.group(2)) / 1000
+    return sorted(totals.items(), key=lambda item: item[1], reverse=True)
+
+
+def loaded_packages(modules=STARTUP_MODULES):
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    code = "; ".join(f"import {name}" for name in modules) + "; import sys; print(' '.join(sys.modules))"
+    result = subprocess.run([sys.executable, "-c", code], cwd=root, capture_output=True, text=True, check=True)
+    return set(result.stdout.split())
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    totals = measure()
+    total = sum(ms for _, ms in totals)
+    shown = totals if "--all" in argv else totals[:10]
+    print(f"Import przy starcie: {total:.0f} ms")
+    for package, ms in shown:
+        print(f"  {package:<28} {ms:8.1f} ms  {ms / total:6.1%}")
+
+    loaded = [name for name in DEFERRED_PACKAGES if name in loaded_packages()]
+    if loaded:
+        print(f"⚠️ Ładowane przy starcie, choć potrzebne później: {', '.join(loaded)}")
+        return 1
+    print("✅ pandas, requests i eksport XLSX ładują się dopiero przy pierwszym użyciu")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
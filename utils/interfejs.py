@@ -0,0 +1,491 @@
+import io
+
+import streamlit as st
+
+from utils.dziennik import get_journal
+from utils.pytania import CATEGORY_EMOJIS, QuestionDeck, UsedQuestions, category_names, get_question_store
+from utils.wyszukiwanie import get_search_index
+from utils.wysylka import get_upload_queue
+
+# ------------------------------
+# Wspólny silnik ekranów gry
+# ------------------------------
+#
+# Ekrany, przyciski, punktacja, ekran końcowy i zapis wyników są wspólne dla wszystkich trybów;
+# tryb z pakietu tryby opisuje tylko swój ekran graczy, kolejność ról, zasady punktacji i wiersz wyników.
+
+# ------------------------------
+# Inicjalizacja sesji
+# ------------------------------
+
+def get_game(mode):
+    # Jeden obiekt stanu gry na sesję, tworzony przy pierwszym wejściu w tryb
+    game = st.session_state.get("game")
+    if game is None or game.mode != mode.NAME:
+        game = st.session_state.game = mode.new_game()
+    return game
+
+# ------------------------------
+# Losowanie pytania
+# ------------------------------
+
+def get_deck(game):
+    # Talia budowana raz na start gry, przebudowywana tylko po zmianie kategorii
+    if game.deck is None or not game.deck.matches(game.chosen_categories):
+        store = get_question_store()
+        game.used = UsedQuestions(store) if game.used is None else game.used.for_store(store)
+        game.deck = QuestionDeck.build(store, game.chosen_categories, game.used)
+    return game.deck
+
+def draw_question(game):
+    deck = get_deck(game)
+    ordinal = deck.draw()
+    if ordinal is None:
+        return None
+    record(game, question_event(deck, ordinal))
+    return game.current_question
+
+def question_event(deck, ordinal):
+    # id zostaje na wypadek odtwarzania na innej wersji banku; zwykle wystarcza numer porządkowy
+    return {"type": "question", "id": deck.store.ids[ordinal], "ordinal": int(ordinal), "bank": deck.store.path}
+
+# ------------------------------
+# Zdarzenia gry (dziennik)
+# ------------------------------
+
+def record(game, event):
+    # Zmiana stanu gry jest od razu stosowana, a dziennik zapisuje ją w tle
+    game.apply(event)
+    get_journal().append(game, event)
+
+def save_answer(game, points, row, questions_per_round, tallies=()):
+    # points to pary (gracz/drużyna, punkty) - przy powtórzonym imieniu punkty sumują się jak wcześniej;
+    # tallies to trójki (nazwa sumy, gracz/drużyna, punkty) dla podsumowań trybu
+    event = {"type": "score", "points": points, "row": row, "per_round": questions_per_round}
+    if tallies:
+        event["tallies"] = tallies
+    record(game, event)
+    if not game.ask_continue:
+        draw_question(game)
+
+def resume_game():
+    # Po przeładowaniu strony (nowa sesja) wracamy do gry zapisanej w dzienniku pod id z adresu
+    game = get_journal().resume(st.query_params.get("gra"), get_question_store())
+    if game is None:
+        st.query_params.clear()
+        return
+    st.session_state.game = game
+    st.session_state.mode = game.mode
+    st.session_state.step = "end" if game.finished else "game"
+
+# ------------------------------
+# Przejścia między ekranami
+# ------------------------------
+
+# Dozwolone przejścia: ekran -> ekrany, na które można z niego przejść
+TRANSITIONS = {
+    "mode_select": {"setup"},
+    "setup": {"mode_select", "categories"},
+    "categories": {"setup", "game"},
+    "game": {"end"},
+    "end": {"game", "mode_select"},
+}
+
+# Przyciski zmieniają stan w callbackach on_click, które Streamlit wywołuje przed przebiegiem skryptu,
+# więc kliknięcie to jeden przebieg zamiast dwóch (zmiana stanu + st.rerun()).
+
+def go_to(step):
+    current = st.session_state.step
+    if step not in TRANSITIONS[current]:
+        raise ValueError(f"Niedozwolone przejście: {current} -> {step}")
+    st.session_state.step = step
+
+def select_mode(mode):
+    st.session_state.mode = mode
+    go_to("setup")
+
+def back_to_mode_select():
+    st.session_state.clear()
+    st.query_params.clear()
+    st.session_state.step = "mode_select"
+    st.session_state.mode = "None"
+
+def confirm_players(game):
+    # Imiona bierzemy prosto z pól - zmiana wpisana tuż przed kliknięciem też się liczy
+    game.players = [st.session_state[f"player_name_{i}"].strip() for i in range(len(game.players))]
+    if all(game.players):
+        game.all_players = game.players.copy()
+        game.scores = {player: 0 for player in game.all_players}
+        go_to("categories")
+
+def toggle_category(game, cat):
+    if cat in game.category_selection:
+        game.category_selection.remove(cat)
+    else:
+        game.category_selection.add(cat)
+
+def leave_categories(game):
+    game.category_selection = set()
+    go_to("setup")
+
+def start_game(game):
+    game.chosen_categories = list(game.category_selection)
+    get_deck(game)
+    st.query_params["gra"] = get_journal().start(game)
+    go_to("game")
+
+def choose_points(game, name, value):
+    setattr(game, name, value)
+
+def change_question(game):
+    draw_question(game)
+
+def pick_question(game, ordinal):
+    deck = get_deck(game)
+    deck.take(ordinal)
+    record(game, question_event(deck, ordinal))
+    del st.session_state["search_query"]
+
+def continue_game(game):
+    game.ask_continue = False
+    draw_question(game)
+
+def finish_game(game):
+    record(game, {"type": "end"})
+    go_to("end")
+
+def extend_game(game):
+    game.ask_continue = False
+    draw_question(game)
+    go_to("game")
+
+# ------------------------------
+# Przyciski
+# ------------------------------
+
+def setup_buttons(game):
+    col1, col2 = st.columns([1, 1])
+    with col1:
+        st.button("🔙 Powrót", on_click=back_to_mode_select)
+
+    with col2:
+        if all(game.players):
+            st.button("✅ Dalej", on_click=confirm_players, args=(game,))
+def end_buttons(game):
+    col1, col2 = st.columns(2)
+    with col1:
+        st.button("🔁 Jeszcze nie kończymy!", on_click=extend_game, args=(game,))
+    with col2:
+        st.button("🔚 Koniec gry", on_click=back_to_mode_select)
+
+# ------------------------------
+# Branding
+# ------------------------------
+
+def branding_szek():
+    st.markdown(
+        """
+        <div style='margin-top: -20px; font-size: 10px; color: gray;'>Spectrum - made by Szek</div>
+        """,
+        unsafe_allow_html=True
+        )
+
+# ------------------------------
+# Upload na github
+# ------------------------------
+
+# Wysyłka idzie w tle (utils.wysylka) - ekran końcowy nie czeka na GitHuba, tylko co sekundę
+# odczytuje stan zlecenia we fragmencie, dopóki wysyłka trwa
+
+UPLOAD_POLL_SECONDS = 1
+
+def upload_key(game):
+    return game.game_id or str(id(game))
+
+def retry_upload(game, uploads):
+    uploads.submit(upload_key(game), export_results(game))
+
+@st.fragment(run_every=UPLOAD_POLL_SECONDS)
+def upload_progress(uploads, key):
+    status = uploads.status(key)
+    if status["state"] in ("done", "failed"):
+        st.rerun()  # pełny przebieg pokaże wynik i przestanie odpytywać
+    attempt = f" (próba {status['attempts']})" if status["attempts"] > 1 else ""
+    st.info(f"⏳ Zapisywanie wyników online{attempt}...")
+
+def upload_results_once(game):
+    # --- Upload na GitHub tylko raz ---
+    if not game.results_uploaded:
+        try:
+            token = st.secrets["GITHUB_TOKEN"]
+            # Opcjonalnie: wspólny commit dla gier z kilku stołów (utils.wysylka, tryb zbiorczy)
+            batch = (st.secrets.get("GITHUB_BATCH_SECONDS"), st.secrets.get("GITHUB_BATCH_GAMES"))
+        except Exception:
+            token, batch = None, (None, None)
+
+        if token:
+            uploads = get_upload_queue(token, *batch)
+            key = upload_key(game)
+            # Plik do wysyłki potrzebny tylko z tokenem - bez niego XLSX powstaje dopiero przy pobieraniu
+            status = uploads.status(key) or uploads.submit(key, export_results(game))
+
+            if status["state"] == "done":
+                st.success(f"✅ Wyniki zapisane online.")
+                record(game, {"type": "uploaded"})
+            elif status["state"] == "failed":
+                st.error(f"❌ Błąd zapisu: {status['error']}")
+                st.button("🔁 Spróbuj ponownie", on_click=retry_upload, args=(game, uploads))
+            else:
+                upload_progress(uploads, key)
+        else:
+            st.warning("⚠️ Nie udało się zapisać wyników online.")
+
+# ------------------------------
+# Panel punktacji
+# ------------------------------
+
+# Wybór punktów przerysowuje tylko panel. Zapis odpowiedzi zmienia pytanie, więc następny przebieg
+# fragmentu (zaraz po callbacku) widzi inny numer pytania i odświeża całą aplikację.
+@st.fragment
+def scoring_panel(game, questions_asked, guesser_prompt, extra_prompt, save, save_args):
+    if game.questions_asked != questions_asked or st.session_state.step != "game":
+        st.rerun()
+
+    st.markdown(guesser_prompt)
+    cols = st.columns(4)
+    for i, val in enumerate([0, 2, 3, 4]):
+        label = f"✅ {val}" if game.guesser_points == val else f"{val}"
+        cols[i].button(label, key=f"gp_{val}_{questions_asked}", on_click=choose_points, args=(game, "guesser_points", val))
+
+    if extra_prompt:
+        st.markdown(extra_prompt)
+        cols2 = st.columns(2)
+        for i, val in enumerate([0, 1]):
+            label = f"✅ {val}" if game.extra_point == val else f"{val}"
+            cols2[i].button(label, key=f"ep_{val}_{questions_asked}", on_click=choose_points, args=(game, "extra_point", val))
+
+    if game.guesser_points is not None and (not extra_prompt or game.extra_point is not None):
+        st.button("💾 Zapisz i dalej", on_click=save, args=save_args)
+
+# ------------------------------
+# Ekran kategorii
+# ------------------------------
+
+def category_selection_screen(game, category_names, CATEGORY_EMOJIS):
+    st.header("📚 Wybierz kategorie pytań")
+    category_grid(game, category_names, CATEGORY_EMOJIS)
+
+# Wybór kategorii przerysowuje tylko ten fragment; pełny przebieg dopiero po przejściu do innego ekranu
+@st.fragment
+def category_grid(game, category_names, CATEGORY_EMOJIS):
+    if st.session_state.step != "categories":
+        st.rerun()
+
+    store = get_question_store()
+    tag_counts = store.tag_counts()
+    cols = st.columns(4)
+    for i, cat in enumerate(category_names):
+        col = cols[i % 4]
+        display_name = f"{CATEGORY_EMOJIS.get(cat, '')} {cat} ({tag_counts.get(cat, 0)})"
+        label = f"✅ {display_name}" if cat in game.category_selection else display_name
+        col.button(label, key=f"cat_{cat}", on_click=toggle_category, args=(game, cat))
+
+    selected_display = [f"{CATEGORY_EMOJIS.get(cat, '')} {cat}" for cat in game.category_selection]
+    st.markdown(f"**Wybrane kategorie:** {', '.join(selected_display) or 'Brak'}")
+    # Pytanie z kilkoma wybranymi tagami liczy się raz
+    st.markdown(f"**Dostępne pytania:** {store.count(game.category_selection)}")
+
+    col1, col2 = st.columns([1, 1])
+    with col1:
+        st.button("🔙 Powrót", on_click=leave_categories, args=(game,))
+
+    with col2:
+        if game.category_selection:
+            st.button("🎯 Rozpocznij grę", on_click=start_game, args=(game,))
+
+def handle_continue_decision(game, questions_per_round):
+    st.header("❓ Czy chcesz kontynuować grę?")
+    rounds_played = game.questions_asked // questions_per_round
+    total_questions = game.questions_asked
+    st.write(f"🥊 Rozegrane rundy: {rounds_played} → {total_questions} pytań 🧠")
+
+    col1, col2 = st.columns(2)
+    with col1:
+        st.button("✅ Tak, kontynuuj", on_click=continue_game, args=(game,))
+    with col2:
+        st.button("❌ Zakończ i pokaż wyniki", on_click=finish_game, args=(game,))
+
+def prepare_next_question(game):
+    if not game.current_question:
+        game.current_question = draw_question(game)
+        if not game.current_question:
+            # Koniec pytań wychodzi dopiero w trakcie rysowania ekranu - tu zostaje zwykły st.rerun()
+            st.success("🎉 Pytania się skończyły! Gratulacje.")
+            finish_game(game)
+            st.rerun()
+
+def round_info(game, q, current_round, current_question_number):
+    st.markdown(f"### 🥊 Runda {current_round}")
+    branding_szek()
+    st.subheader(f"🧠 Pytanie {current_question_number} – kategoria: *{q['categories']}*")
+    st.write(q["text"])
+    st.markdown(f"<small>id: {q['id']} · pozostało pytań: {get_deck(game).remaining()}</small>", unsafe_allow_html=True)
+
+    st.button("🔄 Zmień pytanie", on_click=change_question, args=(game,))
+
+    search_question(game)
+
+def search_question(game):
+    with st.expander("🔎 Wyszukaj pytanie"):
+        query = st.text_input("Słowo kluczowe", key="search_query")
+        if not query:
+            return
+        deck = get_deck(game)
+        index = get_search_index(deck.store.path, deck.store)
+        results = index.search(query, game.chosen_categories, game.used, limit=5)
+        if not results:
+            st.write("Brak pasujących pytań.")
+        for ordinal in results:
+            found = deck.store.question(ordinal)
+            st.button(
+                f"{found['text']} ({found['categories']})", key=f"search_{found['id']}",
+                on_click=pick_question, args=(game, ordinal),
+            )
+
+# ------------------------------
+# Ekran graczy (tryby z listą imion)
+# ------------------------------
+
+def players_setup(game):
+    st.header("🎭 Wprowadź imiona graczy")
+
+    for i in range(len(game.players)):
+        game.players[i] = st.text_input(
+            f"🙋‍♂️ Gracz {i + 1}", value=game.players[i], key=f"player_name_{i}"
+        ).strip()
+
+    setup_buttons(game)
+
+# ------------------------------
+# Ekran gry
+# ------------------------------
+
+def save_scored_answer(game, mode, roles, q, current_round, questions_per_round):
+    guesser_points = game.guesser_points
+    extra_point = game.extra_point
+
+    # Reset wyborów
+    game.guesser_points = None
+    game.extra_point = None
+
+    points, row, tallies = mode.score(roles, q, guesser_points, extra_point, game.questions_asked + 1, current_round)
+    save_answer(game, points, row, questions_per_round, tallies)
+
+def game_screen(game, mode):
+    questions_per_round = mode.questions_per_round(game)
+    if game.ask_continue:
+        handle_continue_decision(game, questions_per_round)
+        return
+
+    roles = mode.roles(game)
+    prepare_next_question(game)
+    q = game.current_question
+    current_round = (game.questions_asked // questions_per_round) + 1
+    current_question_number = game.questions_asked + 1
+    round_info(game, q, current_round, current_question_number)
+
+    st.markdown(mode.roles_line(roles), unsafe_allow_html=True)
+
+    guesser_prompt, extra_prompt = mode.prompts(roles)
+    scoring_panel(
+        game, game.questions_asked, guesser_prompt, extra_prompt,
+        save_scored_answer, (game, mode, roles, q, current_round, questions_per_round),
+    )
+
+# ------------------------------
+# Ekran końcowy
+# ------------------------------
+
+def player_ranking(game):
+    sorted_scores = game.ranked()
+    medale = ["🏆", "🥈", "🥉"]
+    for i, (name, score) in enumerate(sorted_scores):
+        medal = medale[i] if i < 3 else ""
+        st.write(f"{medal} **{name}:** {score} punktów")
+
+def results_version(game):
+    # Wiersze wyników są tylko dopisywane (zdarzenie score), więc ich liczba wystarcza jako wersja
+    return len(game.results_data)
+
+def export_results(game, fmt="xlsx"):
+    # Plik budujemy raz na format i wersję wyników - kolejne rysowania ekranu końcowego biorą gotowe bajty
+    version = results_version(game)
+    cached = game.export.get(fmt)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+
+    from utils.eksport import write_results
+
+    # --- Generowanie pliku z wyników w pamięci ---
+    output = io.BytesIO()
+    write_results(game.results_data[:version], output, fmt, game.game_id or "", game.team_names)
+    data = output.getvalue()
+    game.export[fmt] = (version, data)
+    return data
+
+def results_export(game):
+    from utils.eksport import FORMATS, available_formats
+
+    # Bajty powstają dopiero po kliknięciu pobierania (albo przy wysyłce wyników)
+    st.download_button(
+        label="💾 Pobierz wyniki gry (XLSX)",
+        data=lambda: export_results(game),
+        file_name="wyniki_gry.xlsx",
+        mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+    )
+
+    # Pozostałe formaty mają wspólny schemat dla wszystkich trybów (wiersz na przyznane punkty)
+    other_formats = [fmt for fmt in available_formats() if fmt != "xlsx"]
+    st.caption("Do analizy: jeden wiersz na każde przyznane punkty, te same kolumny w każdym trybie.")
+    cols = st.columns(len(other_formats))
+    for col, fmt in zip(cols, other_formats):
+        spec = FORMATS[fmt]
+        col.download_button(
+            label=f"📄 {spec['label']}",
+            data=lambda fmt=fmt: export_results(game, fmt),
+            file_name=f"wyniki_gry.{spec['extension']}",
+            mime=spec["mime"],
+            key=f"export_{fmt}",
+        )
+
+    upload_results_once(game)
+
+def end_screen(game, mode):
+    total_questions = game.questions_asked
+    total_rounds = total_questions // mode.questions_per_round(game)
+    st.success(f"🎉 Gra zakończona! Oto wyniki końcowe:\n\n🥊 Liczba rund: **{total_rounds}** → **{total_questions}** pytań 🧠")
+
+    mode.end_summary(game)
+
+    st.markdown("---")
+    end_buttons(game)
+
+    if game.results_data:
+        results_export(game)
+
+# ------------------------------
+# Uruchomienie trybu
+# ------------------------------
+
+def run_mode(mode):
+    game = get_game(mode)
+    step = st.session_state.step
+
+    if step == "setup":
+        mode.setup_screen(game)
+    elif step == "categories":
+        category_selection_screen(game, category_names, CATEGORY_EMOJIS)
+    elif step == "game":
+        game_screen(game, mode)
+    elif step == "end":
+        end_screen(game, mode)
@@ -0,0 +1,103 @@
+import argparse
+import sys
+import zlib
+
+from utils.bank_pytan import prune_bank, write_bank
+from utils.pytania import BANK_PATH, QUESTIONS_PATH, category_names, file_hash, iter_questions_csv
+from utils.wyszukiwanie import trigrams
+
+# ------------------------------
+# Kompilator banku pytań
+# ------------------------------
+#
+# Sprawdza questions.csv i zapisuje gotowy bank z indeksem wyszukiwania, który aplikacja
+# tylko mapuje przy starcie:
+#
+#   python -m utils.kompilator [questions.csv] [--output questions.bank] [--check] [--strict]
+
+# MinHash: 64 funkcje haszujące w 16 pasmach po 4 - para o podobieństwie Jaccarda 0.8
+# trafia do wspólnego kubełka z prawdopodobieństwem ~99,98%, para o podobieństwie 0.3 - ~12%.
+NUM_HASHES = 64
+BANDS = 16
+DUPLICATE_THRESHOLD = 0.8
+
+_PRIME = (1 << 61) - 1
+_SEEDS = [((i * 0x9E3779B1 + 1) % _PRIME, (i * 0x85EBCA77 + 7) % _PRIME) for i in range(NUM_HASHES)]
+
+
+def validate(path):
+    # Zwraca (pytania, błędy, ostrzeżenia); błędy podają numer wiersza w pliku
+    with open(path, encoding="utf-8-sig", newline="") as f:
+        return validate_file(f)
+
+
+def validate_file(f):
+    # To samo dla otwartego pliku tekstowego (np. io.StringIO z treścią już wczytaną do pamięci);
+    # błędne wiersze nie trafiają do listy pytań
+    errors, warnings = [], []
+    questions = list(iter_questions_csv(f, errors, warnings))
+    return questions, errors, warnings
+
+
+def minhash(grams):
+    hashes = [zlib.crc32(gram.encode("utf-8")) for gram in grams] or [0]
+    return tuple(min((a * h + b) % _PRIME for h in hashes) for a, b in _SEEDS)
+
+
+def near_duplicates(texts, threshold=DUPLICATE_THRESHOLD):
+    # LSH: porównujemy dokładnie tylko pary, które wpadły do wspólnego kubełka w którymś paśmie
+    grams = [trigrams(text) for text in texts]
+    rows = NUM_HASHES // BANDS
+    buckets = {}
+    candidates = set()
+    for i, signature in enumerate(minhash(g) for g in grams):
+        for band in range(BANDS):
+            key = (band, signature[band * rows:(band + 1) * rows])
+            for j in buckets.setdefault(key, []):
+                candidates.add((j, i))
+            buckets[key].append(i)
+
+    pairs = []
+    for i, j in sorted(candidates):
+        union = len(grams[i] | grams[j])
+        similarity = len(grams[i] & grams[j]) / union if union else 1.0
+        if similarity >= threshold:
+            pairs.append((i, j, similarity))
+    return pairs
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Kompilacja questions.csv do binarnego banku pytań")
+    parser.add_argument("csv_path", nargs="?", default=QUESTIONS_PATH)
+    parser.add_argument("--output", default=BANK_PATH, help="katalog banku (domyślnie questions.bank)")
+    parser.add_argument("--check", action="store_true", help="tylko sprawdź plik, nie zapisuj banku")
+    parser.add_argument("--strict", action="store_true", help="traktuj prawie-duplikaty jako błędy")
+    parser.add_argument("--threshold", type=float, default=DUPLICATE_THRESHOLD, help="próg podobieństwa prawie-duplikatów")
+    args = parser.parse_args(argv)
+
+    questions, errors, warnings = validate(args.csv_path)
+    for i, j, similarity in near_duplicates([text for _, text, _ in questions], args.threshold):
+        message = f"prawie-duplikaty ({similarity:.0%}): {questions[i][0]} i {questions[j][0]}"
+        (errors if args.strict else warnings).append(message)
+
+    for message in warnings:
+        print(f"⚠️ {message}", file=sys.stderr)
+    for message in errors:
+        print(f"❌ {message}", file=sys.stderr)
+    if errors:
+        return 1
+
+    if not args.check:
+        version_dir = write_bank(
+            args.output, iter(questions), category_names,
+            source_hash=file_hash(args.csv_path), index_terms=trigrams,
+        )
+        prune_bank(args.output)
+        print(f"✅ Skompilowano {len(questions)} pytań do {version_dir}")
+    else:
+        print(f"✅ Plik poprawny: {len(questions)} pytań")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
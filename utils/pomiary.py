@@ -0,0 +1,349 @@
+import argparse
+import io
+import logging
+import os
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+# ------------------------------
+# Pomiary wydajności
+# ------------------------------
+#
+# Odtwarza liczby podane w opisach zmian. Każdy przypadek idzie w osobnym procesie, więc szczyt pamięci (RSS)
+# dotyczy tylko jego, a nie wcześniejszych przypadków:
+#
+#   python -m utils.pomiary eksport [--rows 10000 1000000] [--pandas]
+#   python -m utils.pomiary pytania [--reruns 200]
+#   python -m utils.pomiary pamiec
+#   python -m utils.pomiary przebiegi
+#   python -m utils.pomiary wysylka [--games 30] [--fail-rate 0.3]
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+EXPORT_ROWS = (10_000, 1_000_000)
+EXPORT_PLAYERS = ("Ala", "Ola", "Ela")
+# Role w kolejnych pytaniach gry 3-osobowej: (odpowiada, zgaduje, dodatkowo) jako numery graczy
+EXPORT_ROLES = ((0, 2, 1), (1, 2, 0), (2, 1, 0), (0, 1, 2), (1, 0, 2), (2, 0, 1))
+
+RERUNS = 200
+
+APP_PATH = os.path.join(ROOT, "streamlit_app.py")
+# Jeden stół na tryb: (tryb, imiona, liczba pytań, pytań w rundzie)
+TABLES = (
+    ("2-osobowy", ("Ala", "Ola"), 20, 2),
+    ("3-osobowy", ("Ala", "Ola", "Ela"), 18, 6),
+    ("Drużynowy", ("A1", "A2", "B1", "B2"), 16, 4),
+)
+
+UPLOAD_GAMES = 30
+ARCHIVE_FILES = 300  # pliki wyników z poprzednich dni w repo
+UPLOAD_LATENCY = 0.005  # opóźnienie każdej odpowiedzi serwera
+CONNECT_COST = 0.03  # koszt nowego połączenia, jak uzgadnianie TLS
+
+
+def peak_rss_mb():
+    # ru_maxrss na Linuksie jest w KiB
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def run_case(*args):
+    # Jeden przypadek w świeżym interpreterze; wypisuje jedną linię wyniku
+    result = subprocess.run(
+        [sys.executable, "-m", "utils.pomiary", *args], cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    return result.stdout.strip()
+
+
+# ------------------------------
+# Eksport XLSX
+# ------------------------------
+
+def export_rows(n):
+    # Wiersze gry 3-osobowej w kształcie results_data
+    for i in range(n):
+        responder, guesser, extra = (EXPORT_PLAYERS[j] for j in EXPORT_ROLES[i % len(EXPORT_ROLES)])
+        yield {
+            "r_pytania": i + 1, "kategoria": "Śmieszne",
+            "pytanie": f"Pytanie numer {i} o coś całkiem zwyczajnego?",
+            "odpowiada": responder, "zgaduje": guesser, "dodatkowo": extra,
+            responder: 2, guesser: 3, extra: 1,
+        }
+
+
+def export_case(writer, n):
+    # pandas - dawny zapis przez DataFrame do BytesIO; stream - write_xlsx z listy wierszy do pliku;
+    # generator - write_xlsx prosto z generatora z podanymi kolumnami (bez listy w pamięci)
+    from utils.eksport import result_columns, write_xlsx
+
+    rows = None if writer == "generator" else list(export_rows(n))
+    base = peak_rss_mb()
+    start = time.perf_counter()
+    if writer == "pandas":
+        import pandas as pd
+
+        output = io.BytesIO()
+        with pd.ExcelWriter(output, engine="xlsxwriter") as excel:
+            pd.DataFrame(rows).to_excel(excel, index=False, sheet_name="Wyniki")
+        size = len(output.getvalue())
+    else:
+        with tempfile.TemporaryFile() as output:
+            if writer == "generator":
+                columns = result_columns(export_rows(len(EXPORT_ROLES)))
+                write_xlsx(export_rows(n), output, columns)
+            else:
+                write_xlsx(rows, output)
+            size = output.tell()
+    elapsed = time.perf_counter() - start
+    peak = peak_rss_mb()
+    return (f"{writer:<9} {n:>9} wierszy  {elapsed:8.2f} s  szczyt RSS {peak:6.0f} MB"
+            f"  (+{peak - base:.0f} MB w trakcie zapisu)  plik {size / 1e6:.1f} MB")
+
+
+def export_report(sizes, pandas=False):
+    print("Eksport XLSX, wiersze gry 3-osobowej:")
+    for n in sizes:
+        for writer in ("pandas", "stream", "generator") if pandas else ("stream", "generator"):
+            print("  " + run_case("_eksport", writer, str(n)))
+
+
+# ------------------------------
+# Pytania przy każdym przebiegu skryptu
+# ------------------------------
+
+def load_categories_pandas():
+    # Dawny początek streamlit_app.py, wykonywany przy każdym przebiegu skryptu
+    import pandas as pd
+
+    from utils.pytania import QUESTIONS_PATH, category_names
+
+    df = pd.read_csv(QUESTIONS_PATH, sep=';')
+    return df, {cat: df[df["categories"] == cat].to_dict(orient="records") for cat in category_names}
+
+
+def rerun_case(loader, reruns):
+    # pandas - wczytanie CSV i słowniki kategorii; store - pobranie wspólnego magazynu (cache_resource).
+    # Pierwsze wywołanie (import, ewentualna kompilacja banku) liczymy osobno
+    if loader == "pandas":
+        load = load_categories_pandas
+    else:
+        logging.getLogger("streamlit").setLevel(logging.ERROR)  # poza serwerem cache_resource ostrzega
+        from utils.pytania import get_question_store
+
+        load = get_question_store
+    start = time.perf_counter()
+    load()
+    first = time.perf_counter() - start
+    times = []
+    for _ in range(reruns):
+        start = time.perf_counter()
+        load()
+        times.append(time.perf_counter() - start)
+    return (f"{loader:<7} pierwszy przebieg {first * 1000:8.1f} ms, kolejne: mediana "
+            f"{statistics.median(times) * 1000:8.3f} ms, maks. {max(times) * 1000:8.3f} ms ({reruns} przebiegów)")
+
+
+def rerun_report(reruns):
+    print("Pytania przy przebiegu skryptu:")
+    for loader in ("pandas", "store"):
+        print("  " + run_case("_pytania", loader, str(reruns)))
+
+
+# ------------------------------
+# Pamięć pytań w procesie
+# ------------------------------
+
+def memory_case(layout):
+    # Obiekty Pythona, które zostają w procesie po wczytaniu pytań (tracemalloc, bez samych importów);
+    # zmapowane pliki banku nie są alokacjami procesu - system współdzieli ich strony między procesami
+    from utils.pytania import BANK_PATH, QUESTIONS_PATH, QuestionStore, load_question_store
+
+    if layout == "pandas":
+        load_categories_pandas()  # leniwe importy wewnątrz pandas nie są częścią danych
+        tracemalloc.start()
+        df, categories = load_categories_pandas()
+        with_frame = tracemalloc.get_traced_memory()[0]
+        del df
+        lists = tracemalloc.get_traced_memory()[0]
+        return (f"pandas  DataFrame + słowniki kategorii {with_frame / 1024:8.0f} KiB, "
+                f"same słowniki kategorii {lists / 1024:8.0f} KiB ({sum(map(len, categories.values()))} pytań)")
+
+    version_dir = load_question_store(QUESTIONS_PATH, BANK_PATH).path  # kompilacja poza pomiarem
+    tracemalloc.start()
+    store = QuestionStore(version_dir)
+    allocated = tracemalloc.get_traced_memory()[0]
+    mapped = sum(entry.stat().st_size for entry in os.scandir(version_dir) if entry.is_file())
+    return (f"store   obiekty magazynu {allocated / 1024:8.0f} KiB, "
+            f"zmapowane pliki banku {mapped / 1024:8.0f} KiB (współdzielone) ({len(store)} pytań)")
+
+
+def memory_report():
+    print("Pamięć pytań w jednym procesie:")
+    for layout in ("pandas", "store"):
+        print("  " + run_case("_pamiec", layout))
+
+
+# ------------------------------
+# Przebiegi skryptu na jedną grę
+# ------------------------------
+
+def table_case(mode):
+    # Cała gra w AppTest (ustawienia, 2 kategorie, pytania, koniec): ile kliknięć, ile przebiegów skryptu
+    # i ile czasu procesora (razem z samym AppTest). Przebiegi liczy dopisany na początku skryptu licznik
+    from streamlit.testing.v1 import AppTest
+
+    _, names, questions, per_round = next(table for table in TABLES if table[0] == mode)
+    with open(APP_PATH, encoding="utf-8") as f:
+        source = f.read()
+    counter = 'import streamlit as _st\n_st.session_state["_przebiegi"] = _st.session_state.get("_przebiegi", 0) + 1\n'
+    at = AppTest.from_string(counter + source, default_timeout=30)
+    taps = 0
+
+    def tap(label=None, key=None):
+        nonlocal taps
+        button = next(b for b in at.button if (key and b.key == key) or (label and b.label.startswith(label)))
+        button.click()
+        at.run()
+        taps += 1
+
+    def tap_prefix(prefix):
+        keys = [b.key for b in at.button if b.key and b.key.startswith(prefix)]
+        if keys:
+            tap(key=keys[0])
+
+    at.run()
+    start_runs, start = at.session_state["_przebiegi"], time.process_time()
+    tap(mode)
+    inputs = [t for t in at.text_input if t.key and t.key.startswith("player_")] if mode == "Drużynowy" else at.text_input
+    for widget, name in zip(inputs, names):
+        widget.input(name)
+    at.run()
+    taps += 1
+    tap("✅ Dalej")
+    tap(key="cat_Śmieszne")
+    tap(key="cat_Wolisz")
+    tap("🎯")
+    for n in range(questions):
+        if n and n % per_round == 0:
+            tap("✅ Tak")
+        tap_prefix("gp_3")
+        tap_prefix("ep_1")
+        tap("💾")
+    tap("❌")
+    cpu = time.process_time() - start
+    if at.exception:
+        raise RuntimeError(at.exception[0].value)
+    runs = at.session_state["_przebiegi"] - start_runs
+    return (f"{mode:<10} {questions:>3} pytań  kliknięcia {taps:>3}  przebiegi skryptu {runs:>3}  "
+            f"CPU {cpu:5.1f} s  wyniki {dict(at.session_state.game.scores)}")
+
+
+def table_report():
+    print("Jedna gra na tryb (AppTest):")
+    for mode, *_ in TABLES:
+        print("  " + run_case("_przebiegi", mode))
+
+
+# ------------------------------
+# Wysyłka wyników
+# ------------------------------
+
+def upload_case(games, fail_rate):
+    # Gry wysyłane po jednej (jak kolejne stoły) do lokalnego zastępcy GitHuba z testów
+    sys.path.insert(0, os.path.join(ROOT, "tests"))
+    from fake_github import FakeGitHub
+
+    from utils.wysylka import UploadQueue
+
+    github = FakeGitHub(fail_rate=fail_rate, latency=UPLOAD_LATENCY, connect_cost=CONNECT_COST, seed=3)
+    github.commit_files({
+        f"wyniki/gra{i % 20 + 1:03d}_2025-{i // 560 + 7:02d}-{i // 20 % 28 + 1:02d}.xlsx": b"archiwum %d" % i
+        for i in range(ARCHIVE_FILES)
+    }, "archiwum")
+    queue = UploadQueue("token", api=github.url, backoff=0.05)
+    before = dict(github.stats)
+    latencies = []
+    for game in range(games):
+        key = f"gra{game}"
+        start = time.perf_counter()
+        queue.submit(key, b"x" * 7000 + key.encode("ascii"))
+        while queue.status(key)["state"] in ("queued", "sending"):
+            time.sleep(0.001)
+        latencies.append(time.perf_counter() - start)
+        if queue.status(key)["state"] != "done":
+            raise RuntimeError(f"{key}: {queue.status(key)['error']}")
+    queue.close()
+    github.close()
+
+    stats = {name: github.stats[name] - before.get(name, 0) for name in github.stats}
+    requests = " ".join(f"{method} {stats[method]}" for method in ("GET", "PUT", "POST", "PATCH") if stats[method])
+    return (f"awarie {fail_rate:.0%}: opóźnienie średnio {statistics.mean(latencies) * 1000:5.0f} ms "
+            f"(pierwsza gra {latencies[0] * 1000:.0f} ms), połączenia {stats['connections']}, {requests}, "
+            f"304: {stats['304']}, na grę {stats['bytes_out'] / games / 1024:.1f} KiB w dół "
+            f"i {stats['bytes_in'] / games / 1024:.1f} KiB w górę")
+
+
+def upload_report(games, fail_rates):
+    print(f"Wysyłka {games} gier po jednej (odpowiedź {UPLOAD_LATENCY * 1000:.0f} ms, "
+          f"nowe połączenie {CONNECT_COST * 1000:.0f} ms, {ARCHIVE_FILES} plików w archiwum):")
+    for fail_rate in fail_rates:
+        print("  " + run_case("_wysylka", str(games), str(fail_rate)))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pomiary wydajności Spectrum")
+    commands = parser.add_subparsers(dest="command", required=True)
+    export = commands.add_parser("eksport", help="czas i szczyt RSS zapisu wyników do XLSX")
+    export.add_argument("--rows", type=int, nargs="+", default=EXPORT_ROWS)
+    export.add_argument("--pandas", action="store_true", help="porównaj z dawnym zapisem przez pandas (wolny)")
+    single = commands.add_parser("_eksport")  # jeden przypadek, uruchamiany przez run_case
+    single.add_argument("writer", choices=("pandas", "stream", "generator"))
+    single.add_argument("n", type=int)
+    questions = commands.add_parser("pytania", help="koszt dostępu do pytań przy każdym przebiegu skryptu")
+    questions.add_argument("--reruns", type=int, default=RERUNS)
+    single = commands.add_parser("_pytania")
+    single.add_argument("loader", choices=("pandas", "store"))
+    single.add_argument("reruns", type=int)
+    commands.add_parser("pamiec", help="pamięć zajmowana przez pytania w procesie")
+    single = commands.add_parser("_pamiec")
+    single.add_argument("layout", choices=("pandas", "store"))
+    commands.add_parser("przebiegi", help="przebiegi skryptu i CPU na jedną grę w każdym trybie")
+    single = commands.add_parser("_przebiegi")
+    single.add_argument("mode", choices=[table[0] for table in TABLES])
+    upload = commands.add_parser("wysylka", help="opóźnienie, połączenia i bajty wysyłki wyników")
+    upload.add_argument("--games", type=int, default=UPLOAD_GAMES)
+    upload.add_argument("--fail-rate", type=float, nargs="+", default=(0.0, 0.3), help="odsetek odpowiedzi 502")
+    single = commands.add_parser("_wysylka")
+    single.add_argument("games", type=int)
+    single.add_argument("fail_rate", type=float)
+    args = parser.parse_args(argv)
+
+    if args.command == "eksport":
+        export_report(args.rows, args.pandas)
+    elif args.command == "_eksport":
+        print(export_case(args.writer, args.n))
+    elif args.command == "pytania":
+        rerun_report(args.reruns)
+    elif args.command == "_pytania":
+        print(rerun_case(args.loader, args.reruns))
+    elif args.command == "pamiec":
+        memory_report()
+    elif args.command == "_pamiec":
+        print(memory_case(args.layout))
+    elif args.command == "przebiegi":
+        table_report()
+    elif args.command == "_przebiegi":
+        print(table_case(args.mode))
+    elif args.command == "wysylka":
+        upload_report(args.games, args.fail_rate)
+    elif args.command == "_wysylka":
+        print(upload_case(args.games, args.fail_rate))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,485 @@
+import base64
+import csv
+import hashlib
+import io
+import logging
+import os
+import random
+import threading
+import time
+from array import array
+from bisect import bisect_right
+from types import MappingProxyType
+
+import numpy as np
+import streamlit as st
+
+from utils.bank_pytan import (
+    BankShard, ShardIndex, current_version_dir, encode_id, map_array, map_file, prune_bank, read_manifest, write_bank,
+)
+
+logger = logging.getLogger(__name__)
+
+# ------------------------------
+# Kategorie pytań
+# ------------------------------
+
+QUESTIONS_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "questions.csv")
+BANK_PATH = os.path.splitext(QUESTIONS_PATH)[0] + ".bank"
+
+category_names = [
+    "Śmieszne", "Światopoglądowe", "Związkowe", "Pikantne",
+    "Luźne", "Przeszłość", "Wolisz", "Dylematy"
+]
+
+CATEGORY_EMOJIS = {
+    "Śmieszne": "😂", "Światopoglądowe": "🌍", "Związkowe": "❤️", "Pikantne": "🌶️",
+    "Luźne": "😎", "Przeszłość": "📜", "Wolisz": "🤔", "Dylematy": "⚖️"
+}
+
+# ------------------------------
+# Wspólny magazyn pytań
+# ------------------------------
+
+class QuestionIds:
+    # Widok na id pytań - napis "fun001" powstaje dopiero przy odczycie
+    __slots__ = ("_store",)
+
+    def __init__(self, store):
+        self._store = store
+
+    def __len__(self):
+        return len(self._store)
+
+    def __getitem__(self, ordinal):
+        shard, index = self._store._locate(ordinal)
+        return shard.id(index)
+
+
+class QuestionStore:
+    # Niezmienny bank pytań jednej wersji, współdzielony przez wszystkie sesje.
+    # Pytania o tym samym pierwszym tagu mają kolejne numery porządkowe (ordinal), a teksty leżą w shardach.
+    # Wszystkie pliki wersji mapujemy przy otwarciu (to tylko nagłówki - strony z tekstami system wczytuje
+    # przy pierwszym odczycie), więc usunięcie wersji przez prune_bank nie psuje trwającej gry.
+    # Wszystkie tagi pytania są zapisane w masce bitowej, więc pula pytań dla dowolnego zestawu
+    # kategorii to jedna wektorowa operacja na tablicy masek.
+    __slots__ = (
+        "path", "source_hash", "category_names", "ids", "by_category",
+        "_shards", "_index_files", "_index_maps", "_indexes", "_shard_tags", "_bases", "_masks", "_tag_counts", "_ordinal_by_id",
+    )
+
+    def __init__(self, path):
+        self.path = path
+        manifest = read_manifest(path)
+        self.source_hash = manifest.get("source_hash")
+        self.category_names = tuple(shard["category"] for shard in manifest["shards"])
+        self._shards = tuple(
+            BankShard(os.path.join(path, shard["file"])) if shard["file"] else None for shard in manifest["shards"]
+        )
+        # Indeksy wyszukiwania: plik mapujemy od razu, listę termów parsujemy dopiero przy wyszukiwaniu
+        self._index_files = tuple(
+            os.path.join(path, shard["index"]) if shard.get("index") else None for shard in manifest["shards"]
+        )
+        self._index_maps = tuple(map_file(name) if name else None for name in self._index_files)
+        self._indexes = {}
+        self._shard_tags = tuple(shard["tags"] for shard in manifest["shards"])
+
+        bases, by_category, total = [], {}, 0
+        for shard in manifest["shards"]:
+            bases.append(total)
+            by_category[shard["category"]] = range(total, total + shard["count"])
+            total += shard["count"]
+        bases.append(total)
+        self._bases = tuple(bases)
+        self.by_category = MappingProxyType(by_category)
+        self.ids = QuestionIds(self)
+
+        self._masks = np.frombuffer(map_array(os.path.join(path, manifest["tags_file"])), dtype=np.uint64)
+        self._tag_counts = None
+        self._ordinal_by_id = None
+
+    def __len__(self):
+        return self._bases[-1]
+
+    def _code(self, ordinal):
+        if not 0 <= ordinal < len(self):
+            raise IndexError(ordinal)
+        return bisect_right(self._bases, ordinal) - 1
+
+    def _locate(self, ordinal):
+        code = self._code(ordinal)
+        return self._shards[code], ordinal - self._bases[code]
+
+    def tag_bits(self, categories):
+        bits = 0
+        for cat in categories:
+            if cat in self.by_category:
+                bits |= 1 << self.category_names.index(cat)
+        return bits
+
+    def shards_for(self, categories):
+        # Kategorie shardów, w których są pytania z którymkolwiek z podanych tagów
+        bits = self.tag_bits(categories)
+        return [cat for cat, tags in zip(self.category_names, self._shard_tags) if tags & bits]
+
+    def index(self, cat):
+        # Gotowy indeks wyszukiwania sharda (jeśli bank zbudował kompilator), inaczej None
+        if cat not in self.by_category:
+            return None
+        code = self.category_names.index(cat)
+        if self._index_maps[code] is None:
+            return None
+        index = self._indexes.get(code)
+        if index is None:
+            index = self._indexes[code] = ShardIndex(self._index_files[code], self._index_maps[code])
+        return index
+
+    def ordinal(self, qid):
+        if self._ordinal_by_id is None:
+            self._ordinal_by_id = {self.ids[o]: o for o in range(len(self))}
+        return self._ordinal_by_id.get(qid)
+
+    def pool_mask(self, categories):
+        # Wektor bool: które pytania mają choć jeden z wybranych tagów
+        return (self._masks & np.uint64(self.tag_bits(categories))) != 0
+
+    def ordinals_for(self, categories):
+        return np.flatnonzero(self.pool_mask(categories)).astype(np.uint32)
+
+    def count(self, categories):
+        return int(np.count_nonzero(self.pool_mask(categories)))
+
+    def tag_counts(self):
+        # Liczba pytań z danym tagiem - stała dla wersji banku, liczona raz
+        if self._tag_counts is None:
+            self._tag_counts = MappingProxyType({cat: self.count([cat]) for cat in self.category_names})
+        return self._tag_counts
+
+    def has_tags(self, ordinal, bits):
+        return bool(int(self._masks[ordinal]) & bits)
+
+    def tags(self, ordinal):
+        mask = int(self._masks[ordinal])
+        return tuple(cat for code, cat in enumerate(self.category_names) if mask >> code & 1)
+
+    def category(self, ordinal):
+        return ", ".join(self.tags(ordinal))
+
+    def text(self, ordinal):
+        shard, index = self._locate(ordinal)
+        return shard.text(index)
+
+    def question(self, ordinal):
+        # Słownik o tym samym kształcie co dawne wiersze z to_dict(orient='records')
+        shard, index = self._locate(ordinal)
+        return {
+            "id": shard.id(index),
+            "text": shard.text(index),
+            "categories": self.category(ordinal),
+        }
+
+
+def file_hash(path):
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def split_tags(value):
+    # Kolumna categories może zawierać kilka tagów rozdzielonych przecinkami, np. "Pikantne,Związkowe"
+    return tuple(tag.strip() for tag in value.split(",") if tag.strip())
+
+
+REQUIRED_COLUMNS = ("id", "text", "categories")
+
+
+def iter_questions_csv(f, errors, warnings=None):
+    # Strumieniowe czytanie i sprawdzanie CSV wiersz po wierszu (bez wczytywania całego pliku do pamięci).
+    # Zwraca tylko poprawne pytania; błędy (z numerem wiersza w pliku) dopisuje do errors
+    canonical = {name.casefold(): name for name in category_names}
+    seen_ids, prefixes = {}, {}
+
+    reader = csv.reader(f, delimiter=';')
+    columns = next(reader, [])
+    missing = [col for col in REQUIRED_COLUMNS if col not in columns]
+    if missing:
+        errors.append(f"Brak kolumn: {', '.join(missing)}")
+        return
+    id_col, text_col, cat_col = (columns.index(col) for col in REQUIRED_COLUMNS)
+
+    for row in reader:
+        line = reader.line_num
+        if not row:
+            continue
+        if len(row) != len(columns):
+            errors.append(f"wiersz {line}: {len(row)} pól zamiast {len(columns)}")
+            continue
+        qid, text = row[id_col].strip(), row[text_col].strip()
+        row_errors = len(errors)
+
+        try:
+            encode_id(qid, prefixes)
+        except ValueError as e:
+            errors.append(f"wiersz {line}: {e}")
+        if qid in seen_ids:
+            errors.append(f"wiersz {line}: id {qid!r} powtarza się (pierwszy raz w wierszu {seen_ids[qid]})")
+        seen_ids.setdefault(qid, line)
+        if not text:
+            errors.append(f"wiersz {line}: puste pytanie {qid!r}")
+
+        tags = []
+        raw_tags = split_tags(row[cat_col])
+        if not raw_tags:
+            errors.append(f"wiersz {line}: pytanie {qid!r} nie ma kategorii")
+        for tag in raw_tags:
+            mapped = canonical.get(tag.casefold())
+            if mapped is None:
+                errors.append(f"wiersz {line}: nieznana kategoria {tag!r}")
+                continue
+            if mapped != tag and warnings is not None:
+                warnings.append(f"wiersz {line}: kategoria {tag!r} zamieniona na {mapped!r}")
+            if mapped not in tags:
+                tags.append(mapped)
+
+        if len(errors) == row_errors:
+            yield qid, text, tuple(tags)
+
+
+def checked_questions(f):
+    # Wiersze dla write_bank: błędy zbieramy z całego pliku i zgłaszamy razem na końcu jako ValueError -
+    # write_bank usuwa wtedy niedokończoną wersję, a w banku zostaje poprzednia
+    errors = []
+    yield from iter_questions_csv(f, errors)
+    if errors:
+        more = f" (i {len(errors) - 3} więcej)" if len(errors) > 3 else ""
+        raise ValueError("; ".join(errors[:3]) + more)
+
+
+def compile_question_bank(csv_path=QUESTIONS_PATH, bank_path=BANK_PATH):
+    source_hash = file_hash(csv_path)
+    with open(csv_path, encoding="utf-8-sig", newline="") as f:
+        version_dir = write_bank(bank_path, checked_questions(f), category_names, source_hash=source_hash)
+    prune_bank(bank_path)
+    return version_dir
+
+
+def load_question_store(csv_path=QUESTIONS_PATH, bank_path=BANK_PATH):
+    # Bank kompilujemy tylko, gdy go nie ma albo CSV jest nowszy; błędny CSV to ValueError
+    pointer = os.path.join(bank_path, "CURRENT")
+    if os.path.exists(pointer) and os.path.getmtime(pointer) >= os.path.getmtime(csv_path):
+        try:
+            return QuestionStore(current_version_dir(bank_path))
+        except (OSError, ValueError):
+            pass  # bank w starym formacie albo niekompletny - kompilujemy od nowa
+    return QuestionStore(compile_question_bank(csv_path, bank_path))
+
+
+# ------------------------------
+# Przeładowanie questions.csv w locie
+# ------------------------------
+
+class QuestionBankWatcher:
+    # Pilnuje questions.csv: po zmianie mtime i treści sprawdza plik (checked_questions) i w tym samym przejściu
+    # przebudowuje bank, po czym podmienia magazyn jednym przypisaniem. Trwające gry trzymają swój magazyn w talii, więc grają
+    # dalej na spójnym zrzucie; bitmapa wykorzystanych pytań przechodzi na nową wersję przy przebudowie talii.
+    # Błędny plik nie zmienia magazynu - trafia tylko do logu (raz na zmianę pliku) i do last_error;
+    # nieudany zapis banku (np. błąd dysku) jest ponawiany przy kolejnym sprawdzeniu.
+    def __init__(self, csv_path=QUESTIONS_PATH, bank_path=BANK_PATH, check_interval=2.0):
+        self.csv_path = csv_path
+        self.bank_path = bank_path
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self.last_error = None
+        self._mtime = os.path.getmtime(csv_path)
+        try:
+            self._store = load_question_store(csv_path, bank_path)
+        except ValueError as e:
+            # Błędny plik już przy starcie: gramy na ostatniej poprawnej wersji banku, jeśli jakaś jest
+            try:
+                self._store = QuestionStore(current_version_dir(bank_path))
+            except (OSError, ValueError):
+                raise e from None
+            self._reload_failed(e)
+        self._checked_at = time.monotonic()
+
+    def current(self):
+        if time.monotonic() - self._checked_at >= self.check_interval:
+            self.check()
+        return self._store
+
+    def check(self):
+        # Inne wątki w tym czasie dostają dotychczasowy magazyn zamiast czekać
+        if not self._lock.acquire(blocking=False):
+            return False
+        try:
+            self._checked_at = time.monotonic()
+            mtime = os.path.getmtime(self.csv_path)
+            if mtime == self._mtime:
+                return False
+            with open(self.csv_path, "rb") as f:
+                content = f.read()
+            source_hash = hashlib.sha256(content).hexdigest()
+            if source_hash == self._store.source_hash:
+                self._mtime = mtime
+                return False
+            try:
+                self._reload(content, source_hash)
+            except ValueError as e:
+                # Błąd w pliku - czekamy na jego kolejną zmianę
+                self._mtime = mtime
+                self._reload_failed(e)
+                return False
+            except Exception as e:
+                # Błąd zapisu albo odczytu banku - mtime zostaje, więc następne sprawdzenie spróbuje ponownie
+                self._reload_failed(e)
+                return False
+            self._mtime = mtime
+            self.last_error = None
+            return True
+        finally:
+            self._lock.release()
+
+    def _reload_failed(self, error):
+        message = f"{self.csv_path}: {error}"
+        if message != self.last_error:
+            logger.warning("Nie przeładowano pytań, zostaje poprzednia wersja banku - %s", message)
+        self.last_error = message
+
+    def _reload(self, content, source_hash):
+        # Inny proces mógł już skompilować tę samą wersję - wtedy tylko ją otwieramy
+        try:
+            on_disk = QuestionStore(current_version_dir(self.bank_path))
+        except (OSError, ValueError):
+            on_disk = None
+        if on_disk is not None and on_disk.source_hash == source_hash:
+            self._store = on_disk
+            return
+
+        # Sprawdzanie i zapis w jednym przejściu po pliku - bez listy wszystkich pytań w pamięci
+        f = io.TextIOWrapper(io.BytesIO(content), encoding="utf-8-sig", newline="")
+        version_dir = write_bank(self.bank_path, checked_questions(f), category_names, source_hash=source_hash)
+        self._store = QuestionStore(version_dir)
+        prune_bank(self.bank_path)
+
+
+# cache_resource zwraca ten sam obiekt wszystkim sesjom (bez kopiowania jak w cache_data),
+# więc bank jest otwierany raz na proces, a nie przy każdym przeładowaniu skryptu.
+@st.cache_resource
+def get_question_watcher():
+    return QuestionBankWatcher()
+
+
+def get_question_store():
+    return get_question_watcher().current()
+
+
+# ------------------------------
+# Wykorzystane pytania jednej gry
+# ------------------------------
+
+class UsedQuestions:
+    # Bitmapa wykorzystanych pytań indeksowana numerem porządkowym w konkretnej wersji banku:
+    # sprawdzenie to odczyt jednego elementu, a liczba dostępnych pytań to jedna operacja na wektorach.
+    # W zrzucie bity są spakowane (~80 bajtów na obecny bank) razem ze ścieżką wersji banku.
+    __slots__ = ("store", "_mask")
+
+    def __init__(self, store, mask=None):
+        self.store = store
+        self._mask = np.zeros(len(store), dtype=bool) if mask is None else mask
+
+    def __contains__(self, ordinal):
+        return bool(self._mask[ordinal])
+
+    def __len__(self):
+        return int(np.count_nonzero(self._mask))
+
+    def add(self, ordinal):
+        self._mask[ordinal] = True
+
+    def available_mask(self, categories):
+        return self.store.pool_mask(categories) & ~self._mask
+
+    def available(self, categories):
+        return int(np.count_nonzero(self.available_mask(categories)))
+
+    def ids(self):
+        return [self.store.ids[o] for o in np.flatnonzero(self._mask).tolist()]
+
+    def for_store(self, store):
+        # Ta sama wersja banku (także otwarta drugi raz, np. przy wznowieniu gry) ma te same numery - bity zostają;
+        # po przeładowaniu banku numery porządkowe się zmieniają - przepisujemy bity przez napisowe id
+        if store is self.store:
+            return self
+        if store.path == self.store.path:
+            return UsedQuestions(store, self._mask)
+        used = UsedQuestions(store)
+        for qid in self.ids():
+            ordinal = store.ordinal(qid)
+            if ordinal is not None:
+                used.add(ordinal)
+        return used
+
+    def snapshot(self):
+        bits = np.packbits(self._mask, bitorder="little").tobytes()
+        return {"bank": self.store.path, "bits": base64.b64encode(bits).decode("ascii")}
+
+    @classmethod
+    def restore(cls, data, store=None):
+        # Zrzut z innej wersji banku otwieramy z jej katalogu (gra w dzienniku trzyma znacznik użycia wersji)
+        if store is None or store.path != data["bank"]:
+            store = QuestionStore(data["bank"])
+        bits = np.frombuffer(base64.b64decode(data["bits"]), dtype=np.uint8)
+        mask = np.unpackbits(bits, count=len(store), bitorder="little").astype(bool)
+        return cls(store, mask)
+
+
+# ------------------------------
+# Talia pytań jednej gry
+# ------------------------------
+
+class QuestionDeck:
+    # Permutacja numerów pytań z wybranych kategorii, tasowana leniwie (Fisher-Yates):
+    # każde losowanie to jedna zamiana i przesunięcie kursora, więc koszt nie zależy od wielkości banku.
+    # Talia trzyma magazyn, z którego powstała - przeładowanie banku nie zmienia pytań trwającej gry.
+    __slots__ = ("store", "categories", "_ordinals", "_cursor")
+
+    def __init__(self, store, ordinals, categories=()):
+        self.store = store
+        self.categories = frozenset(categories)
+        self._ordinals = array("I", np.asarray(ordinals, dtype=np.uint32).tobytes())
+        self._cursor = 0
+
+    @classmethod
+    def build(cls, store, categories, used=None):
+        if used is None:
+            return cls(store, store.ordinals_for(categories), categories)
+        return cls(store, np.flatnonzero(used.for_store(store).available_mask(categories)), categories)
+
+    def matches(self, categories):
+        return self.categories == frozenset(categories)
+
+    def remaining(self):
+        return len(self._ordinals) - self._cursor
+
+    def draw(self, rng=random):
+        ordinals, cursor = self._ordinals, self._cursor
+        if cursor >= len(ordinals):
+            return None
+        j = rng.randrange(cursor, len(ordinals))
+        ordinals[cursor], ordinals[j] = ordinals[j], ordinals[cursor]
+        self._cursor = cursor + 1
+        return ordinals[cursor]
+
+    def take(self, ordinal):
+        # Wyjmuje z talii konkretne pytanie (np. wybrane z wyszukiwarki), żeby nie wylosować go ponownie
+        ordinals, cursor = self._ordinals, self._cursor
+        try:
+            j = ordinals.index(ordinal, cursor)
+        except ValueError:
+            return False
+        ordinals[cursor], ordinals[j] = ordinals[j], ordinals[cursor]
+        self._cursor = cursor + 1
+        return True
+
+    def draw_question(self, rng=random):
+        ordinal = self.draw(rng)
+        return None if ordinal is None else self.store.question(ordinal)
@@ -0,0 +1,122 @@
+from dataclasses import dataclass, field, fields
+from typing import Optional
+
+from utils.pytania import UsedQuestions
+
+# ------------------------------
+# Stan gry jednej sesji
+# ------------------------------
+
+# Pola, które są tylko pamięcią podręczną i nie trafiają do zrzutu (odtwarzane z reszty stanu)
+_RUNTIME_FIELDS = {"deck", "export"}
+
+
+def _add_points(totals, ranking, key, points):
+    # Punkty tylko rosną, więc klucz może się w rankingu jedynie przesunąć w górę - O(liczba graczy)
+    # przy zapisie zamiast sortowania przy każdym rysowaniu; przy remisie wyżej zostaje ten, kto był pierwszy
+    totals[key] = totals.get(key, 0) + points
+    if key not in ranking:
+        ranking.append(key)
+    i = ranking.index(key)
+    while i > 0 and totals.get(ranking[i - 1], 0) < totals[key]:
+        ranking[i - 1], ranking[i] = ranking[i], ranking[i - 1]
+        i -= 1
+
+
+@dataclass(slots=True)
+class GameState:
+    # Wszystkie dane gry w jednym obiekcie zamiast kilkunastu luźnych kluczy st.session_state
+    mode: str
+    players: list = field(default_factory=list)
+    all_players: list = field(default_factory=list)
+    team_names: list = field(default_factory=list)
+    team_rosters: list = field(default_factory=list)  # imiona wpisane w drużynach (z pustymi polami)
+    team_players: dict = field(default_factory=dict)
+    category_selection: set = field(default_factory=set)
+    chosen_categories: list = field(default_factory=list)
+    used: Optional[UsedQuestions] = None  # bitmapa wykorzystanych pytań, powstaje razem z talią
+    current_question: Optional[dict] = None
+    scores: dict = field(default_factory=dict)
+    ranking: list = field(default_factory=list)  # klucze scores od najlepszego (bez tych, kto nie ma punktów)
+    tallies: dict = field(default_factory=dict)  # dodatkowe sumy trybu: {nazwa: {gracz/drużyna: punkty}}
+    tally_rankings: dict = field(default_factory=dict)  # {nazwa: klucze od najlepszego}
+    questions_asked: int = 0
+    ask_continue: bool = False
+    guesser_points: Optional[int] = None
+    extra_point: Optional[int] = None
+    results_data: list = field(default_factory=list)
+    results_uploaded: bool = False
+    finished: bool = False
+    game_id: Optional[str] = None  # klucz gry w dzienniku (utils.dziennik)
+    journal_seq: int = 0
+    deck: object = field(default=None, repr=False, compare=False)
+    export: dict = field(default_factory=dict, repr=False, compare=False)  # {format: (wersja wyników, bajty)}
+
+    def apply(self, event):
+        # Jedyne miejsce zmiany stanu przez zdarzenia - tak samo w trakcie gry i przy odtwarzaniu dziennika
+        kind = event["type"]
+        if kind == "question":
+            store = self.used.store
+            if event.get("bank") == store.path:
+                ordinal = event["ordinal"]
+            else:
+                # Zdarzenie z innej wersji banku (albo sprzed zapisywania numerów) - szukamy po id
+                ordinal = store.ordinal(event["id"])
+            self.used.add(ordinal)
+            self.current_question = store.question(ordinal)
+            self.ask_continue = False
+            self.finished = False
+        elif kind == "score":
+            for key, points in event["points"]:
+                _add_points(self.scores, self.ranking, key, points)
+            for name, key, points in event.get("tallies", ()):
+                _add_points(self.tallies.setdefault(name, {}), self.tally_rankings.setdefault(name, []), key, points)
+            self.results_data.append(event["row"])
+            self.questions_asked += 1
+            self.current_question = None
+            # Po pełnej rundzie pytamy, czy grać dalej
+            self.ask_continue = self.questions_asked % event["per_round"] == 0
+        elif kind == "end":
+            self.finished = True
+        elif kind == "uploaded":
+            self.results_uploaded = True
+        else:
+            raise ValueError(f"Nieznane zdarzenie: {kind!r}")
+
+    def ranked(self, tally=None):
+        # Pary (klucz, punkty) od najlepszego: wynik gry albo jedna z sum trybu (tallies)
+        if tally is None:
+            ranked = [(key, self.scores[key]) for key in self.ranking]
+            ranked_keys = set(self.ranking)
+            return ranked + [(key, points) for key, points in self.scores.items() if key not in ranked_keys]
+        totals = self.tallies.get(tally, {})
+        return [(key, totals[key]) for key in self.tally_rankings.get(tally, [])]
+
+    def snapshot(self):
+        # Zrzut do słownika z typami JSON (zbiory jako posortowane listy); wiersze wyników
+        # po zapisaniu się nie zmieniają, więc wystarczy płytka kopia listy
+        data = {}
+        for f in fields(self):
+            if f.name in _RUNTIME_FIELDS:
+                continue
+            value = getattr(self, f.name)
+            if isinstance(value, UsedQuestions):
+                value = value.snapshot()
+            elif isinstance(value, set):
+                value = sorted(value)
+            elif isinstance(value, list):
+                value = [v[:] if isinstance(v, list) else v for v in value]
+            elif isinstance(value, dict):
+                value = {k: v[:] if isinstance(v, list) else dict(v) if isinstance(v, dict) else v
+                         for k, v in value.items()}
+            data[f.name] = value
+        return data
+
+    @classmethod
+    def restore(cls, data, store=None):
+        # store: aktualny magazyn pytań - użyty, jeśli gra była na tej samej wersji banku
+        state = cls(**{k: v for k, v in data.items() if k not in _RUNTIME_FIELDS})
+        state.category_selection = set(state.category_selection)
+        if state.used is not None:
+            state.used = UsedQuestions.restore(state.used, store)
+        return state
@@ -0,0 +1,169 @@
+import argparse
+import sys
+import time
+
+import numpy as np
+
+from utils.zasady import (
+    GUESSER_POINTS, ROUND_SEQUENCE, questions_per_round_druzynowy, roles_2osobowy, roles_3osobowy,
+    roles_druzynowy, score_2osobowy, score_3osobowy, score_druzynowy,
+)
+
+# ------------------------------
+# Symulator gier bez interfejsu
+# ------------------------------
+#
+# Rozgrywa naraz wiele syntetycznych gier według zasad z utils.zasady: kolejność ról liczymy raz na
+# numer pytania, a punkty losujemy i sumujemy dla całej paczki gier jednym mnożeniem macierzy.
+# Służy do sprawdzania, czy rotacje (np. ROUND_SEQUENCE) są uczciwe, i do strojenia zasad:
+#
+#   python -m utils.symulator --tryb 3-osobowy --gry 1000000 --rundy 3 --punkty 0.3,0.2,0.3,0.2
+
+MODES = ("2-osobowy", "3-osobowy", "Drużynowy")
+
+DEFAULT_GUESSER_PROBS = (0.25, 0.25, 0.25, 0.25)  # prawdopodobieństwa 0, 2, 3 i 4 punktów
+DEFAULT_EXTRA_PROB = 0.5
+DEFAULT_TEAM_SIZES = (2, 2)
+
+CHUNK_GAMES = 100_000
+
+
+def questions_per_round(mode, team_sizes=DEFAULT_TEAM_SIZES):
+    if mode == "2-osobowy":
+        return 2
+    if mode == "3-osobowy":
+        return len(ROUND_SEQUENCE)
+    return questions_per_round_druzynowy(team_sizes)
+
+
+def _one_hot(indices, size):
+    matrix = np.zeros((len(indices), size), dtype=np.float32)
+    matrix[np.arange(len(indices)), indices] = 1
+    return matrix
+
+
+def seat_names(mode, team_sizes=DEFAULT_TEAM_SIZES):
+    if mode == "2-osobowy":
+        return ["Gracz 1", "Gracz 2"]
+    if mode == "3-osobowy":
+        return ["Gracz 1", "Gracz 2", "Gracz 3"]
+    players = [f"Gracz {i + 1} (drużyna {team + 1})" for team in (0, 1) for i in range(team_sizes[team])]
+    return ["Drużyna 1", "Drużyna 2"] + players
+
+
+def seat_layout(mode, questions, team_sizes=DEFAULT_TEAM_SIZES):
+    # Dla każdej składowej punktacji macierz (pytanie x miejsce) z jedynką u gracza, który ją dostaje;
+    # zwraca też liczbę miejsc, które walczą o zwycięstwo (w drużynowym: tylko drużyny)
+    if mode == "2-osobowy":
+        roles = np.array([roles_2osobowy(i) for i in range(questions)])
+        # score_2osobowy -> (zgadujący, odpowiadający)
+        return [_one_hot(roles[:, 1], 2), _one_hot(roles[:, 0], 2)], 2
+    if mode == "3-osobowy":
+        roles = np.array([roles_3osobowy(i) for i in range(questions)])
+        # score_3osobowy -> (zgadujący, dodatkowy punkt, odpowiadający)
+        return [_one_hot(roles[:, 1], 3), _one_hot(roles[:, 2], 3), _one_hot(roles[:, 0], 3)], 3
+
+    roles = np.array([roles_druzynowy(i, team_sizes) for i in range(questions)])
+    seats = 2 + sum(team_sizes)
+    offsets = np.array([2, 2 + team_sizes[0]])
+    # score_druzynowy -> (drużyna zgadująca, druga drużyna, odpowiadający gracz)
+    return [
+        _one_hot(roles[:, 0], seats),
+        _one_hot(roles[:, 1], seats),
+        _one_hot(offsets[roles[:, 0]] + roles[:, 2], seats),
+    ], 2
+
+
+def play(mode, guesser_points, extra_points):
+    # Zasady z utils.zasady wprost na tablicach (gra x pytanie)
+    if mode == "2-osobowy":
+        return score_2osobowy(guesser_points)
+    if mode == "3-osobowy":
+        return score_3osobowy(guesser_points, extra_points)
+    return score_druzynowy(guesser_points, extra_points)
+
+
+def simulate(mode, games, questions, guesser_probs=DEFAULT_GUESSER_PROBS, extra_prob=DEFAULT_EXTRA_PROB,
+             team_sizes=DEFAULT_TEAM_SIZES, seed=None):
+    rng = np.random.default_rng(seed)
+    layout, competing = seat_layout(mode, questions, team_sizes)
+    seats = layout[0].shape[1]
+    points_table = np.array(GUESSER_POINTS, dtype=np.int8)
+    cdf = np.cumsum(guesser_probs) / np.sum(guesser_probs)
+
+    total = np.zeros(seats)
+    total_sq = np.zeros(seats)
+    wins = np.zeros(competing)
+    ties = 0
+    for start in range(0, games, CHUNK_GAMES):
+        n = min(CHUNK_GAMES, games - start)
+        guesser_points = points_table[np.searchsorted(cdf, rng.random((n, questions), dtype=np.float32))]
+        extra_points = (rng.random((n, questions), dtype=np.float32) < extra_prob).astype(np.int8)
+
+        scores = np.zeros((n, seats), dtype=np.float32)
+        for points, matrix in zip(play(mode, guesser_points, extra_points), layout):
+            scores += points.astype(np.float32) @ matrix
+        total += scores.sum(axis=0)
+        total_sq += (scores.astype(np.float64) ** 2).sum(axis=0)
+
+        # Zwycięstwa - przy remisie dzielimy grę między wszystkich z najlepszym wynikiem
+        leaders = scores[:, :competing] == scores[:, :competing].max(axis=1, keepdims=True)
+        leader_count = leaders.sum(axis=1)
+        wins += (leaders / leader_count[:, None]).sum(axis=0)
+        ties += int((leader_count > 1).sum())
+
+    mean = total / games
+    return {
+        "seats": seat_names(mode, team_sizes),
+        "mean": mean,
+        "std": np.sqrt(np.maximum(total_sq / games - mean ** 2, 0)),
+        "wins": wins / games,
+        "ties": ties / games,
+        # Ile razy każde miejsce było w danej roli (kolumny jak w score_* z utils.zasady)
+        "roles": np.stack([matrix.sum(axis=0) for matrix in layout], axis=1).astype(int),
+    }
+
+
+def _floats(text):
+    return tuple(float(value) for value in text.split(","))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m utils.symulator", description="Symulacja gier Spectrum")
+    parser.add_argument("--tryb", choices=MODES, default="3-osobowy")
+    parser.add_argument("--gry", type=int, default=1_000_000)
+    parser.add_argument("--rundy", type=int, default=3)
+    parser.add_argument("--pytania", type=int, help="liczba pytań w grze (zamiast pełnych rund)")
+    parser.add_argument("--punkty", type=_floats, default=DEFAULT_GUESSER_PROBS,
+                        help="prawdopodobieństwa 0,2,3,4 punktów zgadującego")
+    parser.add_argument("--dodatkowy", type=float, default=DEFAULT_EXTRA_PROB,
+                        help="prawdopodobieństwo dodatkowego punktu")
+    parser.add_argument("--druzyny", type=lambda text: tuple(int(v) for v in text.split(",")),
+                        default=DEFAULT_TEAM_SIZES, help="liczby graczy w drużynach, np. 3,2")
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args(argv)
+    if len(args.punkty) != len(GUESSER_POINTS):
+        parser.error(f"--punkty wymaga {len(GUESSER_POINTS)} wartości (dla {GUESSER_POINTS})")
+
+    questions = args.pytania or args.rundy * questions_per_round(args.tryb, args.druzyny)
+    started = time.perf_counter()
+    result = simulate(args.tryb, args.gry, questions, args.punkty, args.dodatkowy, args.druzyny, args.seed)
+    elapsed = time.perf_counter() - started
+
+    print(f"{args.tryb}: {args.gry} gier po {questions} pytań w {elapsed:.2f} s "
+          f"({args.gry / elapsed * 60:,.0f} gier/min)")
+    print(f"  {'miejsce':<28} {'średnio':>8} {'odch.':>7} {'wygrane':>8}  role")
+    for i, name in enumerate(result["seats"]):
+        wins = f"{result['wins'][i]:8.1%}" if i < len(result["wins"]) else " " * 8
+        roles = " ".join(f"{count:3d}" for count in result["roles"][i])
+        print(f"  {name:<28} {result['mean'][i]:8.2f} {result['std'][i]:7.2f} {wins}  {roles}")
+    print(f"  remisy: {result['ties']:.1%}")
+
+    competing = result["mean"][:len(result["wins"])]
+    gap = competing.max() - competing.min()
+    print(f"  różnica średnich: {gap:.3f} pkt" + ("" if gap < 0.05 else "  ⚠️ rotacja faworyzuje część miejsc"))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,502 @@
+import atexit
+import base64
+import hashlib
+import json
+import random
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import streamlit as st
+
+# ------------------------------
+# Wysyłka wyników na GitHub w tle
+# ------------------------------
+#
+# Ekran końcowy tylko zleca wysyłkę i odczytuje jej stan - zapytania do GitHuba (numer gry, PUT pliku)
+# idą w puli wątków wspólnej dla całego procesu. Jedna gra to jedno zlecenie (klucz: id gry), więc
+# kolejne rysowania ekranu i ponowienia nie wysyłają pliku drugi raz. requests importujemy dopiero w wątku.
+#
+# W trybie zbiorczym (batch_seconds / batch_games) gry czekają chwilę na inne i idą na GitHuba jednym
+# commitem przez Git Data API (bloby, drzewo, commit, przesunięcie gałęzi) - mniej commitów i zapytań
+# w ciągu ruchliwego wieczoru. Każda gra i tak dostaje własny stan "done" ze swoją ścieżką.
+
+GITHUB_API = "https://api.github.com"
+REPO = "DawidS25/SpectrumBySzek"  # zmień na swoje repo
+BRANCH = "main"
+RESULTS_FOLDER = "wyniki"
+COUNTER_FOLDER = f"{RESULTS_FOLDER}/liczniki"
+
+# Ile wysyłek naraz, ile prób na grę i odstęp przed kolejną próbą (podwajany, z górnym limitem)
+MAX_WORKERS = 2
+MAX_ATTEMPTS = 5
+MAX_CONFLICTS = 20  # ile razy z rzędu można przegrać wyścig o numer albo licznik z inną grą
+CONFLICT_PAUSE_SECONDS = 0.05  # losowa przerwa po przegranym wyścigu, rośnie z liczbą porażek
+BACKOFF_SECONDS = 1.0
+BACKOFF_MAX_SECONDS = 30.0
+REQUEST_TIMEOUT = (5, 30)  # (połączenie, odpowiedź) w sekundach
+ETAG_CACHE_SIZE = 8  # ile odpowiedzi z ETagiem pamiętamy (katalog, liczniki dni, gałąź) - najdawniej używane wypadają
+
+# Tryb zbiorczy: commit najpóźniej tyle sekund po pierwszej czekającej grze albo od razu po zebraniu tylu gier
+BATCH_SECONDS = 60.0
+BATCH_GAMES = 20
+
+
+def conflict_pause(conflicts):
+    # Bez przerwy przegrany proces od razu ścigałby się znów z tymi samymi rywalami - i mógłby przegrywać
+    # za każdym razem; losowy odstęp rozsuwa ich w czasie
+    return random.uniform(0, min(CONFLICT_PAUSE_SECONDS * conflicts, BACKOFF_SECONDS))
+
+
+def blob_sha(content):
+    # Tak GitHub liczy "sha" pliku - po nim poznajemy, że plik pod ścieżką to już nasza wysyłka
+    return hashlib.sha1(b"blob %d\0" % len(content) + content).hexdigest()
+
+
+class GitHubClient:
+    # Jedna sesja HTTP dla wszystkich wysyłek procesu: pula połączeń keep-alive (bez nowego TLS przy
+    # każdym zapytaniu) i warunkowe GET - ostatnie odpowiedzi z ETagiem trzymamy w pamięci, więc niezmieniony
+    # katalog wyniki/ albo licznik dnia kosztuje 304 bez treści. Odczyty jednorazowe (conditional=False)
+    # do tej pamięci nie trafiają
+    def __init__(self, token, repo=REPO, api=None, pool_size=MAX_WORKERS):
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        self.url = f"{api or GITHUB_API}/repos/{repo}/contents"
+        self.git_url = f"{api or GITHUB_API}/repos/{repo}/git"
+        self.session = requests.Session()
+        self.session.headers.update({
+            "Authorization": f"token {token}",
+            "Accept": "application/vnd.github.v3+json",
+        })
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self._etags = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_json(self, path, conditional=True, ref=None):
+        # Treść odpowiedzi (z pamięci przy 304) albo None, gdy pliku/katalogu nie ma; nie modyfikować wyniku.
+        # ref: odczyt z konkretnego commita zamiast z bieżącego stanu gałęzi
+        url = f"{self.url}/{path}" if ref is None else f"{self.url}/{path}?ref={ref}"
+        return self._get(url, conditional)
+
+    def get_git(self, path, conditional=True):
+        # Obiekty Git Data API (ref, commit) - 304 nie liczy się do limitu zapytań
+        return self._get(f"{self.git_url}/{path}", conditional)
+
+    def _get(self, url, conditional):
+        cached = None
+        if conditional:
+            with self._lock:
+                cached = self._etags.get(url)
+                if cached:
+                    self._etags.move_to_end(url)
+        headers = {"If-None-Match": cached[0]} if cached else None
+        response = self.session.get(url, headers=headers, timeout=REQUEST_TIMEOUT)
+        if response.status_code == 304 and cached:
+            return cached[1]
+        if response.status_code == 429 or response.status_code >= 500:
+            response.raise_for_status()  # przejściowa awaria - wysyłka spróbuje ponownie
+        if response.status_code != 200:
+            return None
+        data = response.json()
+        etag = response.headers.get("ETag")
+        if etag and conditional:
+            with self._lock:
+                self._etags[url] = (etag, data)
+                self._etags.move_to_end(url)
+                while len(self._etags) > ETAG_CACHE_SIZE:
+                    self._etags.popitem(last=False)
+        return data
+
+    def put_file(self, path, content, commit_message, sha=None):
+        # Treść pliku prosto z pamięci: jedno kodowanie base64 i gotowe ciało JSON w bajtach, bez pliku
+        # tymczasowego i bez ponownego przepuszczania dużego napisu przez json.dumps. Z sha GitHub nadpisuje
+        # plik tylko wtedy, gdy to wciąż ta wersja (inaczej 409) - na tym opiera się licznik gier
+        b64_content = base64.b64encode(content)
+        data = b"".join([
+            b'{"message": ', json.dumps(commit_message).encode("utf-8"),
+            b', "branch": ', json.dumps(BRANCH).encode("ascii"), b', "sha": "%s"' % sha.encode("ascii") if sha else b"",
+            b', "content": "', b64_content, b'"}',
+        ])
+        return self.session.put(
+            f"{self.url}/{path}", data=data, headers={"Content-Type": "application/json"}, timeout=REQUEST_TIMEOUT,
+        )
+
+    def post_blob(self, content):
+        # Ciało budowane jak w put_file; zwraca odpowiedź z "sha" bloba
+        data = b'{"encoding": "base64", "content": "' + base64.b64encode(content) + b'"}'
+        return self.session.post(
+            f"{self.git_url}/blobs", data=data, headers={"Content-Type": "application/json"}, timeout=REQUEST_TIMEOUT,
+        )
+
+    def post_git(self, kind, payload):
+        # kind: "trees" albo "commits"
+        return self.session.post(f"{self.git_url}/{kind}", json=payload, timeout=REQUEST_TIMEOUT)
+
+    def update_branch(self, commit_sha):
+        # Bez force GitHub przesuwa gałąź tylko do przodu - jeśli ktoś w międzyczasie dodał commit, odpowie 422
+        return self.session.patch(
+            f"{self.git_url}/refs/heads/{BRANCH}", json={"sha": commit_sha, "force": False}, timeout=REQUEST_TIMEOUT,
+        )
+
+    def file_sha(self, path, ref=None):
+        # Jednorazowe sprawdzenie (odpowiedź zawiera cały plik) - bez zapamiętywania
+        data = self.get_json(path, conditional=False, ref=ref)
+        return data.get("sha") if isinstance(data, dict) else None
+
+
+def get_next_game_number(client, folder=RESULTS_FOLDER, ref=None):
+    # Przegląda cały katalog - używane już tylko raz dziennie, do założenia licznika dnia
+    files = client.get_json(folder, conditional=ref is None, ref=ref)
+    if not isinstance(files, list):
+        return 1
+
+    today_str = datetime.today().strftime("%Y-%m-%d")
+    max_num = 0
+    for file in files:
+        name = file["name"]
+        if name.startswith("gra") and name.endswith(".xlsx") and today_str in name:
+            try:
+                num_part = name[3:6]
+                num = int(num_part)
+                if num > max_num:
+                    max_num = num
+            except:
+                pass
+    return max_num + 1
+
+
+def counter_path(day):
+    return f"{COUNTER_FOLDER}/{day}.json"
+
+
+def read_counter(client, day, ref=None):
+    # (ostatni numer dnia, sha pliku licznika); bez licznika numer z przeglądu katalogu i sha None.
+    # Z ref - stan z tego commita (każdy commit czytamy raz, więc bez pamięci ETagów)
+    current = client.get_json(counter_path(day), conditional=ref is None, ref=ref)
+    if current is None:
+        # Pierwsza gra dnia: licznik zaczyna się za grami zapisanymi dziś bez licznika
+        return get_next_game_number(client, ref=ref) - 1, None
+    return json.loads(base64.b64decode(current["content"]))["ostatni"], current["sha"]
+
+
+def counter_content(number):
+    return json.dumps({"ostatni": number}).encode("utf-8")
+
+
+def result_path(number, day):
+    return f"{RESULTS_FOLDER}/gra{number:03d}_{day}.xlsx"
+
+
+class GameNumbers:
+    # Numer gry z licznika dnia w repo (COUNTER_FOLDER/<dzień>.json) zamiast przeglądania całego wyniki/:
+    # odczyt licznika i zapis n+1 z sha odczytanej wersji - jeśli ktoś był szybszy (409/422), czytamy
+    # jeszcze raz. Koszt jednej gry nie zależy od wielkości archiwum, a dwa stoły nie dostaną tego samego
+    # numeru. W procesie przydzielamy po kolei, żeby własne wątki nie przegrywały ze sobą wyścigu.
+    def __init__(self, client):
+        self.client = client
+        self._lock = threading.Lock()
+
+    def allocate(self, day):
+        with self._lock:
+            for conflicts in range(1, MAX_CONFLICTS + 1):
+                last, sha = read_counter(self.client, day)
+                number = last + 1
+                response = self.client.put_file(
+                    counter_path(day), counter_content(number), f"🔢 Licznik gier {day}: {number}", sha=sha,
+                )
+                if response.status_code in (200, 201):
+                    return number
+                if response.status_code not in (409, 422):
+                    response.raise_for_status()
+                    raise RuntimeError(f"Licznik gier: HTTP {response.status_code}")
+                time.sleep(conflict_pause(conflicts))
+        raise RuntimeError(f"Licznik gier: {MAX_CONFLICTS} razy z rzędu ktoś był szybszy")
+
+
+class UploadQueue:
+    # Stan zlecenia: {"state": "queued" | "sending" | "done" | "failed", "attempts", "path", "error"}
+    # Z batch_seconds albo batch_games gry idą zbiorczo (brakujący próg bierzemy z BATCH_SECONDS/BATCH_GAMES)
+    def __init__(self, token, repo=REPO, api=None, workers=MAX_WORKERS, max_attempts=MAX_ATTEMPTS,
+                 backoff=BACKOFF_SECONDS, batch_seconds=None, batch_games=None):
+        self.token = token
+        self.repo = repo
+        self.api = api or GITHUB_API
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.batching = bool(batch_seconds or batch_games)
+        self.batch_seconds = float(batch_seconds or BATCH_SECONDS)
+        self.batch_games = int(batch_games or BATCH_GAMES)
+        self._jobs = {}
+        self._lock = threading.Lock()
+        self._closing = threading.Event()
+        self._pending = []  # [(klucz, treść)] czekające na commit zbiorczy
+        self._pending_since = None
+        self._batch_ready = threading.Condition(self._lock)
+        self._batcher = None
+        self._blobs = set()  # sha blobów już wysłanych do repo - ponowiona paczka ich nie wysyła
+        self._workers = workers
+        self._client = None
+        self._numbers = None
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="wysylka")
+        atexit.register(self.close)
+
+    def submit(self, key, content):
+        # Zlecenie dla klucza, który już czeka, trwa albo się udał, niczego nie zmienia
+        with self._lock:
+            job = self._jobs.get(key)
+            if job is not None and job["state"] != "failed":
+                return dict(job)
+            path = job["path"] if job else None
+            job = self._jobs[key] = {"state": "queued", "attempts": 0, "path": path, "error": None}
+            if self.batching:
+                self._add_to_batch(key, content)
+                return dict(job)
+        self._executor.submit(self._upload, key, content)
+        return dict(job)
+
+    def status(self, key):
+        with self._lock:
+            job = self._jobs.get(key)
+            return dict(job) if job is not None else None
+
+    def close(self):
+        # Przy zamykaniu procesu kończymy wysyłki bez czekania na kolejne odstępy między próbami,
+        # a czekające gry zapisujemy od razu, nie czekając na koniec okna
+        with self._lock:
+            self._closing.set()
+            self._batch_ready.notify_all()
+            batcher = self._batcher
+        if batcher is not None:
+            batcher.join()
+        self._executor.shutdown(wait=True)
+
+    def client(self):
+        # Sesję (i import requests) tworzymy przy pierwszej wysyłce, w wątku puli
+        with self._lock:
+            if self._client is None:
+                self._client = GitHubClient(self.token, self.repo, self.api, pool_size=self._workers)
+                self._numbers = GameNumbers(self._client)
+            return self._client
+
+    def _update(self, key, **changes):
+        with self._lock:
+            self._jobs[key].update(changes)
+
+    def _attempt(self, key, content):
+        # True - plik jest na GitHubie; None - numer zajęty przez inną grę; False - spróbuj ponownie po przerwie;
+        # RuntimeError - nie ma sensu ponawiać
+        client = self.client()
+        path = self.status(key)["path"]
+        if path is None:
+            today_str = datetime.today().strftime("%Y-%m-%d")
+            next_num = self._numbers.allocate(today_str)
+            path = result_path(next_num, today_str)
+            self._update(key, path=path)
+
+        file_name = path.rsplit("/", 1)[-1]
+        response = client.put_file(path, content, f"🎉 Wyniki gry {file_name}")
+        if response.status_code in (200, 201):
+            return True
+        if response.status_code == 422:
+            # Ścieżka zajęta: albo to nasz plik z próby, której odpowiedź nie dotarła, albo plik zapisany
+            # bez licznika (np. starsza wersja aplikacji) - wtedy bierzemy kolejny numer
+            if client.file_sha(path) == blob_sha(content):
+                return True
+            self._update(key, path=None, error=f"{file_name} już istnieje")
+            return None
+        if response.status_code in (408, 429) or response.status_code >= 500:
+            self._update(key, error=f"HTTP {response.status_code}")
+            return False
+        raise RuntimeError(f"HTTP {response.status_code}: {response.text[:200]}")
+
+    def _upload(self, key, content):
+        import requests
+
+        # Zajęty numer to nie awaria sieci: próbujemy od razu z kolejnym, bez odstępu i bez liczenia próby
+        attempts = conflicts = 0
+        while attempts < self.max_attempts and conflicts < MAX_CONFLICTS:
+            self._update(key, state="sending", attempts=attempts + 1)
+            try:
+                result = self._attempt(key, content)
+            except (requests.RequestException, ValueError) as e:
+                result = False
+                self._update(key, error=str(e))
+            except RuntimeError as e:
+                self._update(key, state="failed", error=str(e))
+                return
+            except Exception as e:
+                # Nieoczekiwany błąd (np. uszkodzony licznik) - zlecenie nie może zostać w "sending" na zawsze
+                self._update(key, state="failed", error=f"{type(e).__name__}: {e}")
+                return
+            if result:
+                self._update(key, state="done", error=None)
+                return
+            if result is None:
+                conflicts += 1
+                self._closing.wait(conflict_pause(conflicts))
+                continue
+            attempts += 1
+            if attempts < self.max_attempts:
+                self._update(key, state="queued")
+                self._closing.wait(min(self.backoff * 2 ** (attempts - 1), BACKOFF_MAX_SECONDS))
+        self._update(key, state="failed")
+
+    # ------------------------------
+    # Tryb zbiorczy
+    # ------------------------------
+
+    def _add_to_batch(self, key, content):
+        # Wołane pod self._lock. Wątek zbierający jest demonem - przy wyjściu budzi go close() z atexit
+        # (wątków niebędących demonami Python czekałby przed atexit, czyli do końca okna)
+        if not self._pending:
+            self._pending_since = time.monotonic()
+        self._pending.append((key, content))
+        if self._batcher is None or not self._batcher.is_alive():
+            self._batcher = threading.Thread(target=self._run_batches, name="wysylka-zbiorcza", daemon=True)
+            self._batcher.start()
+        self._batch_ready.notify_all()
+
+    def _next_batch(self):
+        # Czeka, aż zbierze się batch_games gier albo minie batch_seconds od pierwszej; [] przy zamykaniu
+        with self._lock:
+            while not self._pending and not self._closing.is_set():
+                self._batch_ready.wait()
+            deadline = (self._pending_since or 0) + self.batch_seconds
+            while (self._pending and len(self._pending) < self.batch_games and not self._closing.is_set()
+                   and time.monotonic() < deadline):
+                self._batch_ready.wait(deadline - time.monotonic())
+            batch, self._pending = self._pending[:self.batch_games], self._pending[self.batch_games:]
+            self._pending_since = time.monotonic() if self._pending else None
+            return batch
+
+    def _run_batches(self):
+        while True:
+            batch = self._next_batch()
+            if not batch:
+                return
+            try:
+                self._flush(batch)
+            except Exception as e:
+                # Wątek musi przeżyć - inaczej każda kolejna gra czekałaby w kolejce bez końca
+                for key, _ in batch:
+                    self._update(key, state="failed", error=f"{type(e).__name__}: {e}")
+
+    def _flush(self, batch):
+        import requests
+
+        # Te same zasady co w _upload, tylko dla całej paczki: przegrany wyścig o gałąź to nie awaria sieci
+        attempts = conflicts = 0
+        while batch and attempts < self.max_attempts and conflicts < MAX_CONFLICTS:
+            for key, _ in batch:
+                self._update(key, state="sending", attempts=attempts + 1)
+            try:
+                result = self._commit_batch(batch)
+            except (requests.RequestException, ValueError) as e:
+                result = False
+                for key, _ in batch:
+                    self._update(key, error=str(e))
+            except Exception as e:
+                error = str(e) if isinstance(e, RuntimeError) else f"{type(e).__name__}: {e}"
+                for key, _ in batch:
+                    self._update(key, state="failed", error=error)
+                return
+            batch = [(key, content) for key, content in batch if self.status(key)["state"] != "done"]
+            if result:
+                return
+            if result is None:
+                conflicts += 1
+                self._closing.wait(conflict_pause(conflicts))
+                continue
+            attempts += 1
+            if attempts < self.max_attempts:
+                for key, _ in batch:
+                    self._update(key, state="queued")
+                self._closing.wait(min(self.backoff * 2 ** (attempts - 1), BACKOFF_MAX_SECONDS))
+        for key, _ in batch:
+            self._update(key, state="failed")
+
+    def _commit_batch(self, batch):
+        # Wynik jak w _attempt: True - wszystkie gry zapisane; None - gałąź przesunęła się, trzeba od nowa;
+        # False - spróbuj ponownie po przerwie. Udane gry dostają stan "done" od razu
+        client = self.client()
+
+        # Ścieżka zostaje przy grze, gdy nie wiemy, czy commit wszedł (zgubiona odpowiedź) - sprawdzamy plik
+        todo = []
+        for key, content in batch:
+            path = self.status(key)["path"]
+            if path is not None and client.file_sha(path) == blob_sha(content):
+                self._update(key, state="done", path=path, error=None)
+            else:
+                todo.append((key, content))
+        if not todo:
+            return True
+
+        head = client.get_git(f"ref/heads/{BRANCH}")
+        # Commit się nie zmienia, a każda paczka czyta inny - nie ma czego odświeżać warunkowo
+        commit = client.get_git(f"commits/{head['object']['sha']}", conditional=False) if head else None
+        if commit is None:
+            raise RuntimeError(f"Brak gałęzi {BRANCH}")
+
+        # Licznik i zajęte ścieżki czytamy z tego samego commita, na którym budujemy drzewo - nowy commit
+        # wejdzie tylko na ten stan gałęzi, więc nie nadpisze pliku, którego w nim nie widzieliśmy.
+        # Numer, pod którym plik już jest (np. z wersji aplikacji sprzed licznika), pomijamy
+        ref = commit["sha"]
+        today_str = datetime.today().strftime("%Y-%m-%d")
+        number, _ = read_counter(client, today_str, ref=ref)
+        entries, names = [], []
+        for key, content in todo:
+            number += 1
+            while client.file_sha(result_path(number, today_str), ref=ref) is not None:
+                number += 1
+            sha = blob_sha(content)
+            if sha not in self._blobs:
+                response = client.post_blob(content)
+                if response.status_code != 201:
+                    return self._batch_error(todo, response)
+                self._blobs.add(sha)
+            path = result_path(number, today_str)
+            entries.append({"path": path, "mode": "100644", "type": "blob", "sha": sha})
+            names.append(path.rsplit("/", 1)[-1])
+        entries.append({"path": counter_path(today_str), "mode": "100644", "type": "blob",
+                        "content": counter_content(number).decode("utf-8")})
+
+        response = client.post_git("trees", {"base_tree": commit["tree"]["sha"], "tree": entries})
+        if response.status_code != 201:
+            return self._batch_error(todo, response)
+        message = f"🎉 Wyniki gier {names[0]}" + (f" … {names[-1]} ({len(names)})" if len(names) > 1 else "")
+        response = client.post_git("commits", {
+            "message": message, "tree": response.json()["sha"], "parents": [commit["sha"]],
+        })
+        if response.status_code != 201:
+            return self._batch_error(todo, response)
+
+        for (key, _), entry in zip(todo, entries):
+            self._update(key, path=entry["path"])
+        response = client.update_branch(response.json()["sha"])
+        if response.status_code == 200:
+            for key, _ in todo:
+                self._update(key, state="done", error=None)
+            return True
+        if response.status_code in (409, 422):
+            # Ktoś był szybszy - nasz commit nie wszedł, numery weźmiemy na nowo od nowego heada
+            for key, _ in todo:
+                self._update(key, path=None, error="gałąź zmieniona w trakcie zapisu")
+            return None
+        return self._batch_error(todo, response)
+
+    def _batch_error(self, todo, response):
+        if response.status_code in (408, 429) or response.status_code >= 500:
+            for key, _ in todo:
+                self._update(key, error=f"HTTP {response.status_code}")
+            return False
+        raise RuntimeError(f"HTTP {response.status_code}: {response.text[:200]}")
+
+
+@st.cache_resource
+def get_upload_queue(token, batch_seconds=None, batch_games=None):
+    return UploadQueue(token, batch_seconds=batch_seconds, batch_games=batch_games)
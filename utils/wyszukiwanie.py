@@ -0,0 +1,95 @@
+import threading
+import unicodedata
+from array import array
+
+import streamlit as st
+
+# ------------------------------
+# Wyszukiwanie pytań (indeks trigramów)
+# ------------------------------
+
+# Ilu kandydatów z indeksu najwyżej oceniamy po pełnym tekście
+MAX_CANDIDATES = 2000
+# Jaka część trigramów zapytania musi wystąpić w pytaniu
+MIN_SCORE = 0.5
+
+
+def normalize(text):
+    # Małe litery bez polskich znaków, żeby "zolw" znajdował "żółw"
+    text = unicodedata.normalize("NFKD", text.lower().replace("ł", "l"))
+    return "".join(ch if ch.isalnum() else " " for ch in text if not unicodedata.combining(ch))
+
+
+def trigrams(text):
+    grams = set()
+    for word in normalize(text).split():
+        padded = f" {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+class SearchIndex:
+    # Odwrócony indeks trigram -> pozycje pytań w shardzie kategorii. Jeśli bank ma indeks z kompilatora,
+    # mapujemy go z dysku; w przeciwnym razie budujemy go leniwie tylko dla przeszukiwanych kategorii.
+    def __init__(self, store):
+        self.store = store
+        self._postings = {}
+        self._lock = threading.Lock()
+
+    def _category_postings(self, cat):
+        postings = self._postings.get(cat)
+        if postings is None:
+            with self._lock:
+                postings = self._postings.get(cat)
+                if postings is None:
+                    postings = self._postings[cat] = self._load_postings(cat)
+        return postings
+
+    def _load_postings(self, cat):
+        index = self.store.index(cat)
+        if index is not None:
+            return index
+        postings = {}
+        for index, ordinal in enumerate(self.store.by_category.get(cat, ())):
+            for gram in trigrams(self.store.text(ordinal)):
+                postings.setdefault(gram, array("I")).append(index)
+        return postings
+
+    def search(self, query, categories, used=(), limit=10):
+        grams = trigrams(query)
+        if not grams:
+            return []
+        phrase = " ".join(normalize(query).split())
+
+        # Kandydaci pochodzą z najrzadszych trigramów zapytania - częste ("czy") niewiele wnoszą
+        candidates = set()
+        for cat in self.store.shards_for(categories):
+            base = self.store.by_category[cat].start
+            postings = self._category_postings(cat)
+            lists = sorted((postings.get(gram, ()) for gram in grams), key=len)
+            for positions in lists[:max(1, len(lists) // 3)]:
+                candidates.update(base + i for i in positions)
+                if len(candidates) >= MAX_CANDIDATES:
+                    break
+
+        # Shard może zawierać też pytania spoza wybranych kategorii (inne tagi) - odsiewamy je maską
+        bits = self.store.tag_bits(categories)
+        ranked = []
+        for ordinal in candidates:
+            if not self.store.has_tags(ordinal, bits) or ordinal in used:
+                continue
+            text = self.store.text(ordinal)
+            score = len(grams & trigrams(text)) / len(grams)
+            if score < MIN_SCORE:
+                continue
+            if phrase in " ".join(normalize(text).split()):
+                score += 1
+            ranked.append((score, -ordinal))
+        ranked.sort(reverse=True)
+        return [-neg for _, neg in ranked[:limit]]
+
+
+# Indeks per wersja banku - po przeładowaniu questions.csv nowa wersja dostaje nowy indeks
+@st.cache_resource(max_entries=2)
+def get_search_index(path, _store):
+    return SearchIndex(_store)
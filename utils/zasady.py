@@ -0,0 +1,73 @@
+# ------------------------------
+# Zasady punktacji i kolejność ról (bez interfejsu)
+# ------------------------------
+#
+# Funkcje działają tak samo na liczbach (gra w aplikacji) i na tablicach NumPy (utils.symulator):
+# używamy tylko arytmetyki i porównań, a wartości logiczne mnożymy przez 1, żeby dawały liczby.
+
+GUESSER_POINTS = (0, 2, 3, 4)
+EXTRA_POINTS = (0, 1)
+
+# Tryb 3-osobowy: (odpowiada, zgaduje, dodatkowo) - po 6 pytaniach każdy był w każdej roli
+ROUND_SEQUENCE = (
+    (0, 2, 1),
+    (1, 2, 0),
+    (2, 1, 0),
+    (0, 1, 2),
+    (1, 0, 2),
+    (2, 0, 1),
+)
+
+
+def responder_points(guesser_points):
+    # 0 -> 0, 2/3 -> 1, 4 -> 2 (inna wartość, np. 1, daje 0)
+    return (guesser_points >= 2) * 1 + (guesser_points == 4) * 1
+
+
+# ------------------------------
+# Tryb 2-osobowy
+# ------------------------------
+
+def roles_2osobowy(question_index):
+    # (odpowiada, zgaduje) - gracze na zmianę
+    responder = question_index % 2
+    return responder, 1 - responder
+
+
+def score_2osobowy(guesser_points):
+    # (punkty zgadującego, punkty odpowiadającego)
+    return guesser_points, responder_points(guesser_points)
+
+
+# ------------------------------
+# Tryb 3-osobowy
+# ------------------------------
+
+def roles_3osobowy(question_index):
+    return ROUND_SEQUENCE[question_index % len(ROUND_SEQUENCE)]
+
+
+def score_3osobowy(guesser_points, extra_point):
+    # (zgadujący, dodatkowy punkt, odpowiadający) - odpowiadający dostaje też punkt za trafiony kierunek
+    return guesser_points, extra_point, responder_points(guesser_points) + (extra_point == 1) * 1
+
+
+# ------------------------------
+# Tryb drużynowy
+# ------------------------------
+
+def roles_druzynowy(question_index, team_sizes):
+    # (drużyna odpowiadająca i zgadująca, pozostała drużyna, indeks odpowiadającego gracza w drużynie);
+    # team_sizes[0] i team_sizes[1] to liczby graczy obu drużyn
+    team = question_index % 2
+    size = team_sizes[1] * team + team_sizes[0] * (1 - team)
+    return team, 1 - team, (question_index // 2) % size
+
+
+def score_druzynowy(guesser_points, extra_point):
+    # (drużyna zgadująca, druga drużyna, odpowiadający gracz)
+    return guesser_points, extra_point, guesser_points
+
+
+def questions_per_round_druzynowy(team_sizes):
+    return max(team_sizes) * 2